@@ -6,6 +6,9 @@
 .. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
 
 Cross section models from Browning.
+
+The models are written with NumPy functions and broadcast over arrays of atomic numbers, energies and angles, e.g.
+``total_elastic_cross_section_browning1994_cm2(Z[:, np.newaxis], E_keV)`` computes a Z x E table in one call.
 """
 
 ###############################################################################
@@ -25,14 +28,12 @@ Cross section models from Browning.
 ###############################################################################
 
 # Standard library modules.
-import math
+import os
 import csv
-from math import acos
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Third party modules.
 import numpy as np
-import scipy.stats
-import scipy.integrate
 
 # Local modules.
 
@@ -58,7 +59,7 @@ def total_elastic_cross_section_rutherford_cm2(atomic_number, electron_energy_ke
     term_a = atomic_number * atomic_number / (electron_energy_keV * electron_energy_keV)
 
     alpha = compute_screening_parameter(atomic_number, electron_energy_keV)
-    term_b = math.pi/(alpha * (1.0 + alpha))
+    term_b = np.pi/(alpha * (1.0 + alpha))
 
     cross_section_cm2 = factor * term_a * term_b
 
@@ -67,7 +68,7 @@ def total_elastic_cross_section_rutherford_cm2(atomic_number, electron_energy_ke
 
 def compute_screening_parameter(atomic_number, energy_keV):
     factor = 3.4e-3
-    term_a = math.pow(atomic_number, 0.67) / energy_keV
+    term_a = np.power(atomic_number, 0.67) / energy_keV
 
     alpha = factor * term_a
     return alpha
@@ -76,16 +77,16 @@ def compute_screening_parameter(atomic_number, energy_keV):
 def average_scattering_angle_rutherford_deg(atomic_number, energy_keV):
     alpha = compute_screening_parameter(atomic_number, energy_keV)
 
-    average_angle_rad = math.pi * math.sqrt(alpha) * math.sqrt(1.0 + alpha) - math.pi * alpha
-    average_angle_deg = math.degrees(average_angle_rad)
+    average_angle_rad = np.pi * np.sqrt(alpha) * np.sqrt(1.0 + alpha) - np.pi * alpha
+    average_angle_deg = np.degrees(average_angle_rad)
     return average_angle_deg
 
 
 def average_scattering_angle_rutherford_decreased_screening_deg(atomic_number, energy_keV):
     alpha = compute_decreased_screening_parameter(atomic_number, energy_keV)
 
-    average_angle_rad = math.pi * math.sqrt(alpha) * math.sqrt(1.0 + alpha) - math.pi * alpha
-    average_angle_deg = math.degrees(average_angle_rad)
+    average_angle_rad = np.pi * np.sqrt(alpha) * np.sqrt(1.0 + alpha) - np.pi * alpha
+    average_angle_deg = np.degrees(average_angle_rad)
     return average_angle_deg
 
 
@@ -103,12 +104,12 @@ def total_elastic_cross_section_browning1991a_cm2(atomic_number, energy_keV):
     Z = atomic_number
     E = energy_keV
     factor = 4.7e-18
-    nominator = math.pow(Z, 1.33) + 0.032*Z*Z
-    denominator = E + 0.0155 * math.pow(Z, 1.33) * math.pow(E, 0.5)
+    nominator = np.power(Z, 1.33) + 0.032*Z*Z
+    denominator = E + 0.0155 * np.power(Z, 1.33) * np.power(E, 0.5)
     term_a = nominator/denominator
 
     u = compute_factor_u(atomic_number, energy_keV)
-    denominator = 1.0 - 0.02 * math.pow(Z, 0.5) * math.exp(-u*u)
+    denominator = 1.0 - 0.02 * np.power(Z, 0.5) * np.exp(-u*u)
     term_b = 1.0/denominator
 
     cross_section_cm2 = factor * term_a * term_b
@@ -117,7 +118,7 @@ def total_elastic_cross_section_browning1991a_cm2(atomic_number, energy_keV):
 
 
 def compute_factor_u(atomic_number, energy_keV):
-    u = math.log10(8.0) * energy_keV * math.pow(atomic_number, -1.33)
+    u = np.log10(8.0) * energy_keV * np.power(atomic_number, -1.33)
     return u
 
 
@@ -129,8 +130,8 @@ def total_elastic_cross_section_browning1994_cm2(atomic_number, energy_keV):
     Z = atomic_number
     E = energy_keV
     factor = 3.0e-18
-    power_z = math.pow(Z, 1.7)
-    power_e = math.pow(E, 0.5)
+    power_z = np.power(Z, 1.7)
+    power_e = np.power(E, 0.5)
     nominator = factor*power_z
     denominator = E + 0.005 * power_z * power_e + 0.0007 * Z * Z / power_e
     cross_section_cm2 = nominator/denominator
@@ -145,11 +146,11 @@ def differential_cross_section_browning1991_cm2_sr(atomic_number, energy_keV, th
     term_a = Z * Z / (E * E)
 
     alpha = compute_screening_parameter_browning1991(atomic_number, energy_keV)
-    denominator = 1.0 - math.cos(theta_rad) - alpha
+    denominator = 1.0 - np.cos(theta_rad) - alpha
     term_b = 1.0 / denominator
 
     nominator = alpha * (alpha + 1.0)
-    denominator = 4.2 * math.pow(E, 1.1)
+    denominator = 4.2 * np.power(E, 1.1)
     term_c = nominator / denominator
 
     differential_cross_section_cm2_sr = factor * term_a * (term_b + term_c)
@@ -158,16 +159,16 @@ def differential_cross_section_browning1991_cm2_sr(atomic_number, energy_keV, th
 
 
 def compute_screening_parameter_browning1991(atomic_number, energy_keV):
-    alpha = 5.5e-4 * math.pow(atomic_number, 0.67) / energy_keV
+    alpha = 5.5e-4 * np.power(atomic_number, 0.67) / energy_keV
     return alpha
 
 
 def ratio_browning1994(atomic_number, energy_keV):
     Z = atomic_number
     E = energy_keV
-    term_a = 300.0 * math.pow(E, 1.0 - Z/2000.0) / Z
+    term_a = 300.0 * np.power(E, 1.0 - Z/2000.0) / Z
 
-    term_b = math.pow(Z, 3.0) / (3.0e5 * E)
+    term_b = np.power(Z, 3.0) / (3.0e5 * E)
 
     ratio = term_a + term_b
     return ratio
@@ -176,40 +177,66 @@ def ratio_browning1994(atomic_number, energy_keV):
 def ratio_browning1994_mcx_ray(atomic_number, energy_keV):
     Z = atomic_number
     E = energy_keV
-    term_a = 300.0 * math.pow(E, 1.0 - Z/2000.0) / Z
+    term_a = 300.0 * np.power(E, 1.0 - Z/2000.0) / Z
 
-    term_b = math.pow(Z, 3.0) / 3.0e5 * E
+    term_b = np.power(Z, 3.0) / 3.0e5 * E
 
     ratio = term_a + term_b
     return ratio
 
 
-def compute_polar_angle_two_random_numbers_rad(atomic_number, energy_keV):
-    random_number1 = np.random.random()
+def compute_polar_angle_two_random_numbers_rad(atomic_number, energy_keV, rng=None):
+    random_number1 = _random(rng)
+    random_number2 = _random(rng)
 
-    return polar_angle_rad(atomic_number, energy_keV, random_number1, random_number1)
+    return polar_angle_rad(atomic_number, energy_keV, random_number1, random_number2)
 
 
-def compute_polar_angle_one_random_number_rad(atomic_number, energy_keV):
-    random_number1 = np.random.random()
+def compute_polar_angle_one_random_number_rad(atomic_number, energy_keV, rng=None):
+    random_number1 = _random(rng)
 
     return polar_angle_rad(atomic_number, energy_keV, random_number1, random_number1)
 
 
+def sample_polar_angles_rad(atomic_number, energy_keV, number_samples, rng=None):
+    """
+    Sample polar angles with :py:func:`polar_angle_rad` and independent random numbers for the angle and the choice
+    between the screened Rutherford and isotropic parts.
+
+    :param atomic_number: atomic number, scalar or array broadcastable to `number_samples`
+    :param energy_keV: electron energy in keV, scalar or array broadcastable to `number_samples`
+    :param number_samples: number or shape of the samples
+    :param rng: :py:class:`numpy.random.Generator`, the global :py:mod:`numpy.random` state when not given
+    :return: the polar angles in rad
+    """
+    random_numbers1 = _random(rng, number_samples)
+    random_numbers2 = _random(rng, number_samples)
+
+    return polar_angle_rad(atomic_number, energy_keV, random_numbers1, random_numbers2)
+
+
+def _random(rng, size=None):
+    """
+    Uniform random numbers from `rng`, or from the global :py:mod:`numpy.random` state seeded by
+    :py:func:`numpy.random.seed` when `rng` is None.
+    """
+    if rng is None:
+        return np.random.random(size)
+    return rng.random(size)
+
+
 def polar_angle_rad(atomic_number, energy_keV, random_number1, random_number2):
+    """
+    Polar angle from the screened Rutherford part with probability ratio / (1 + ratio) selected by `random_number2`,
+    otherwise from the isotropic part, with the angle given by `random_number1`.
+    """
     ratio = ratio_browning1994(atomic_number, energy_keV)
-    if random_number2 <= ratio / (1.0 + ratio):
-        alpha = 7.0e-3 / energy_keV
-        cos_theta = 1.0 - 2.0 * alpha * random_number1 / (1.0 + alpha - random_number1)
-    else:
-        cos_theta = 1.0 - 2.0 * random_number1
-
-    if cos_theta > 1.0:
-        return 0.0
-    elif cos_theta < -1.0:
-        return math.pi
-
-    theta_rad = acos(cos_theta)
+    alpha = 7.0e-3 / energy_keV
+    cos_theta_rutherford = 1.0 - 2.0 * alpha * random_number1 / (1.0 + alpha - random_number1)
+    cos_theta_isotropic = 1.0 - 2.0 * random_number1
+    cos_theta = np.where(random_number2 <= ratio / (1.0 + ratio), cos_theta_rutherford, cos_theta_isotropic)
+
+    theta_rad = np.arccos(np.clip(cos_theta, -1.0, 1.0))
     return theta_rad
 
 
@@ -247,32 +274,190 @@ def save_data(filepath, energies_eV, mean_thetas_rad, totals_nm2):
         writer.writerow(row)
 
 
-def compute_mean_theta_total_browning(atomic_number, energy_eV):
-    number_bins = 50
-    number_samples = 1000000
+class StreamingHistogram:
+    """
+    Histogram with uniform bins accumulated chunk by chunk, the memory does not depend on the number of values.
+
+    Values outside the range are counted in :py:attr:`number_values` but not in the bins, the maximum value of the
+    range is in the last bin like with :py:func:`numpy.histogram`. The sum and the sum of squares of all the values
+    are accumulated for the moments.
+
+    Histograms of the same bins accumulated separately, e.g. by parallel workers, are combined with :py:meth:`merge`.
+    """
+    def __init__(self, number_bins, minimum_value, maximum_value):
+        if not maximum_value > minimum_value:
+            raise ValueError("The maximum value must be larger than the minimum value")
+
+        self.bin_edges = np.linspace(minimum_value, maximum_value, number_bins + 1)
+        self.counts = np.zeros(number_bins, dtype=np.int64)
+        self.number_values = 0
+        self.sum_values = 0.0
+        self.sum_squared_values = 0.0
+
+    @property
+    def number_bins(self):
+        return len(self.counts)
+
+    @property
+    def bin_centers(self):
+        return 0.5 * (self.bin_edges[:-1] + self.bin_edges[1:])
+
+    @property
+    def bin_widths(self):
+        return np.diff(self.bin_edges)
+
+    def add(self, values):
+        """
+        Add the values of a chunk to the bin counts.
+        """
+        values = np.ravel(values)
+        minimum_value = self.bin_edges[0]
+        maximum_value = self.bin_edges[-1]
+
+        values_in_range = values[(values >= minimum_value) & (values <= maximum_value)]
+        indices = ((values_in_range - minimum_value) * (self.number_bins / (maximum_value - minimum_value)))
+        indices = np.minimum(indices.astype(np.intp), self.number_bins - 1)
+
+        self.counts += np.bincount(indices, minlength=self.number_bins)
+        self.number_values += len(values)
+        self.sum_values += float(np.sum(values))
+        self.sum_squared_values += float(np.dot(values, values))
+
+    def merge(self, other):
+        """
+        Add the counts and the moments of another histogram with the same bins.
+        """
+        if not np.array_equal(self.bin_edges, other.bin_edges):
+            raise ValueError("The histograms do not have the same bins")
+
+        self.counts += other.counts
+        self.number_values += other.number_values
+        self.sum_values += other.sum_values
+        self.sum_squared_values += other.sum_squared_values
+
+    @property
+    def mean(self):
+        return self.sum_values / self.number_values
+
+    @property
+    def variance(self):
+        return self.sum_squared_values / self.number_values - self.mean**2
+
+    def densities(self):
+        """
+        Probability densities of the bins normalized with all the added values.
+        """
+        if self.number_values == 0:
+            return np.zeros(self.number_bins)
+        return self.counts / (self.number_values * self.bin_widths)
+
+
+def accumulate_polar_angle_histogram(atomic_number, energy_keV, number_samples, number_bins=100,
+                                     chunk_size=1000000, rng=None, one_random_number=False):
+    """
+    Histogram of sampled polar angles on [0, pi] drawn and accumulated in chunks of at most `chunk_size` samples.
+
+    :param bool one_random_number: use the same random number for the angle and the choice of the distribution part
+        like :py:func:`compute_polar_angle_one_random_number_rad` instead of two independent random numbers
+    :return: :py:class:`StreamingHistogram` of the polar angles in rad
+    """
+    histogram = StreamingHistogram(number_bins, 0.0, np.pi)
+    for start in range(0, number_samples, chunk_size):
+        number_chunk_samples = min(chunk_size, number_samples - start)
+        if one_random_number:
+            random_numbers = _random(rng, number_chunk_samples)
+            polar_angles_rad = polar_angle_rad(atomic_number, energy_keV, random_numbers, random_numbers)
+        else:
+            polar_angles_rad = sample_polar_angles_rad(atomic_number, energy_keV, number_chunk_samples, rng)
+        histogram.add(polar_angles_rad)
+
+    return histogram
+
 
+def accumulate_polar_angle_histogram_parallel(atomic_number, energy_keV, number_samples, number_bins=100,
+                                              chunk_size=1000000, seed=None, number_workers=None, use_threads=False):
+    """
+    Histogram and moments of sampled polar angles computed by a pool of workers.
+
+    Each worker draws its share of the samples with :py:func:`accumulate_polar_angle_histogram` and an independent
+    random stream spawned from ``numpy.random.SeedSequence(seed)``, the histograms are merged in the worker order.
+    The result is reproducible bit for bit for the same seed and number of workers.
+
+    :param seed: entropy of the root :py:class:`numpy.random.SeedSequence`, random when not given
+    :param int number_workers: number of workers and random streams, default to the number of cores
+    :param bool use_threads: use a thread pool instead of a process pool
+    :return: :py:class:`StreamingHistogram` of the polar angles in rad
+    """
+    if number_workers is None:
+        number_workers = os.cpu_count() or 1
+
+    seed_sequences = np.random.SeedSequence(seed).spawn(number_workers)
+    numbers_worker_samples = np.full(number_workers, number_samples // number_workers)
+    numbers_worker_samples[:number_samples % number_workers] += 1
+
+    executor_class = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    with executor_class(max_workers=number_workers) as executor:
+        histograms = list(executor.map(_accumulate_polar_angle_histogram_worker,
+                                       [atomic_number] * number_workers, [energy_keV] * number_workers,
+                                       numbers_worker_samples.tolist(), [number_bins] * number_workers,
+                                       [chunk_size] * number_workers, seed_sequences))
+
+    histogram = histograms[0]
+    for worker_histogram in histograms[1:]:
+        histogram.merge(worker_histogram)
+    return histogram
+
+
+def _accumulate_polar_angle_histogram_worker(atomic_number, energy_keV, number_samples, number_bins, chunk_size,
+                                             seed_sequence):
+    rng = np.random.default_rng(seed_sequence)
+    return accumulate_polar_angle_histogram(atomic_number, energy_keV, number_samples, number_bins, chunk_size, rng)
+
+
+def compute_mean_theta_browning_rad(atomic_number, energy_keV):
+    """
+    Mean polar angle of the mixed screened Rutherford and isotropic distribution sampled by
+    :py:func:`polar_angle_rad`.
+
+    The screened Rutherford part, with probability ratio / (1 + ratio), has the mean angle
+    pi (sqrt(alpha (1 + alpha)) - alpha) with alpha = 7.0e-3 / E and the isotropic part has the mean angle pi / 2.
+    """
+    ratio = ratio_browning1994(atomic_number, energy_keV)
+    probability = ratio / (1.0 + ratio)
+    alpha = 7.0e-3 / energy_keV
+
+    mean_theta_rutherford_rad = np.pi * (np.sqrt(alpha * (1.0 + alpha)) - alpha)
+    mean_theta_rad = probability * mean_theta_rutherford_rad + (1.0 - probability) * np.pi / 2.0
+    return mean_theta_rad
+
+
+def compute_mean_theta_total_browning(atomic_number, energy_eV, method="analytic", number_samples=1000000,
+                                      number_bins=50, rng=None):
+    """
+    Compute the mean polar angle and the total elastic cross section.
+
+    The default `"analytic"` method is exact and broadcasts over arrays of atomic numbers and energies. The
+    `"monte_carlo"` method, for one atomic number and energy, estimates them from the histogram of `number_samples`
+    polar angles sampled with `rng` and is kept as a cross-check.
+
+    :return: the mean polar angle in rad and the total cross section in nm2
+    """
     energy_keV = energy_eV*1.0e-3
     total_cm2 = total_elastic_cross_section_browning1991a_cm2(atomic_number, energy_keV)
     total_nm2 = cm2_to_nm2(total_cm2)
 
-    polar_angles_two_random_numbers_rad = [compute_polar_angle_two_random_numbers_rad(atomic_number, energy_keV)
-                                           for _i in range(number_samples)]
-
-    histogram, bin_edges = np.histogram(polar_angles_two_random_numbers_rad, numbins=number_bins)
-    bin_size = bin_edges[1] - bin_edges[0]
-    histogram /= number_samples*bin_size
-    histogram *= total_nm2
-
-    max_range = bin_edges + bin_size*number_bins
-    thetas_rad = np.arange(bin_edges, max_range, bin_size)
+    if method == "analytic":
+        mean_theta_rad = compute_mean_theta_browning_rad(atomic_number, energy_keV)
+        return mean_theta_rad, total_nm2
+    elif method != "monte_carlo":
+        raise ValueError("Unknown method: {}".format(method))
 
-    # partial_sin_thetas_nm2_sr = [2.0*np.pi*x1*np.sin(x2) for x1,x2 in zip(histogram, thetas_rad)]
-    partial_sin_thetas_nm2_sr = [x1 for x1, x2 in zip(histogram, thetas_rad)]
-    total_calculated_nm2 = scipy.integrate.trapz(partial_sin_thetas_nm2_sr, thetas_rad)
+    histogram = accumulate_polar_angle_histogram(atomic_number, energy_keV, number_samples, number_bins, rng=rng)
+    partials_nm2 = histogram.densities() * total_nm2
+    bin_sizes = histogram.bin_widths
+    thetas_rad = histogram.bin_centers
 
-    # partial_sin_thetas_nm2_sr = [2.0*np.pi*x1*x2*np.sin(x2) for x1,x2 in zip(histogram, thetas_rad)]
-    partial_sin_thetas_nm2_sr = [x1*x2 for x1, x2 in zip(histogram, thetas_rad)]
-    mean_theta_rad = scipy.integrate.trapz(partial_sin_thetas_nm2_sr, thetas_rad)
-    mean_theta_rad = mean_theta_rad/total_calculated_nm2
+    total_calculated_nm2 = np.sum(partials_nm2 * bin_sizes)
+    mean_theta_rad = np.sum(partials_nm2 * thetas_rad * bin_sizes) / total_calculated_nm2
 
     return mean_theta_rad, total_calculated_nm2
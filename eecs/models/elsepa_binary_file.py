@@ -27,32 +27,354 @@ Description
 # Standard library modules.
 import struct
 import logging
+import mmap
+import os.path
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 
 # Project modules.
-from eecs.models.elsepa_cross_section_info import ElsepaCrossSectionInfo
+from eecs.models.elsepa_cross_section_info import ElsepaCrossSectionInfo, POINT_DTYPE
+from eecs.models.elsepa_table import ElsepaTable
+from eecs.models.interpolation import bracket_energies
 
 # Globals and constants variables.
+HEADER_FORMAT = "<idddi"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+
+def read_energies_totals(filepath):
+    """
+    Read only the energy and the total cross section of each record of an ELSEPA binary file.
+
+    The angular data of each record is skipped with a seek using the number of points in the record header.
+
+    :param str filepath: path of the ELSEPA binary file
+    :return: the energies in keV and the total cross sections in nm2
+    """
+    with open(filepath, 'rb') as file:
+        _offsets, energies_keV, total_cs_nm2 = _scan_headers(file)
+
+    return energies_keV, total_cs_nm2
+
+
+def iter_els_cs_info(filepath):
+    """
+    Yield the records of an ELSEPA binary file one at a time.
+
+    Only the current record is kept in memory, which allows to filter or reduce the records of large files.
+
+    :param str filepath: path of the ELSEPA binary file
+    :return: generator of :py:class:`ElsepaCrossSectionInfo`
+    """
+    with open(filepath, 'rb') as file:
+        for _offset, els_cs_info in _iter_els_cs_info(file):
+            yield els_cs_info
+
+
+def write_elsepa_file(filepath, els_cs_info_list):
+    """
+    Write the records in an ELSEPA binary file readable by :py:class:`ElsepaBinaryFile`.
+    """
+    with open(filepath, 'wb') as file:
+        for els_cs_info in els_cs_info_list:
+            els_cs_info.write_file(file)
+
+
+def resample_angular_grid(els_cs_info_list, maximum_cdf_error):
+    """
+    Resample the records on a subset of their common angular grid.
+
+    Points are removed from the grid as long as the linear interpolation of the cumulative distribution (ratios)
+    on the reduced grid reproduces the ratios of all the records at the removed points within `maximum_cdf_error`.
+    The first and last points are always kept.
+
+    :param els_cs_info_list: records sharing the same angular grid
+    :param float maximum_cdf_error: maximum absolute error allowed on the ratios
+    :return: the resampled records and the maximum absolute error on the ratios
+    """
+    els_cs_info_list = list(els_cs_info_list)
+    if len(els_cs_info_list) == 0:
+        return [], 0.0
+
+    theta_rad = els_cs_info_list[0]._theta_rad
+    for els_cs_info in els_cs_info_list:
+        if not np.array_equal(theta_rad, els_cs_info._theta_rad):
+            raise ValueError("The records do not share the same angular grid")
+    ratios = np.stack([els_cs_info._ratios for els_cs_info in els_cs_info_list])
+
+    indices = [0]
+    start = 0
+    while start < len(theta_rad) - 1:
+        end = start + 1
+        while end + 1 < len(theta_rad) and \
+                _segment_cdf_error(theta_rad, ratios, start, end + 1) <= maximum_cdf_error:
+            end += 1
+        indices.append(end)
+        start = end
+    indices = np.array(indices)
+
+    resampled_els_cs_info_list = []
+    maximum_error = 0.0
+    for els_cs_info, ratios_row in zip(els_cs_info_list, ratios):
+        resampled_els_cs_info = ElsepaCrossSectionInfo()
+        resampled_els_cs_info._file_version = els_cs_info._file_version
+        resampled_els_cs_info._atomic_number = els_cs_info._atomic_number
+        resampled_els_cs_info._energy_keV = els_cs_info._energy_keV
+        resampled_els_cs_info._total_cs_nm2 = els_cs_info._total_cs_nm2
+        resampled_els_cs_info._number_points = len(indices)
+        resampled_els_cs_info._ratios = ratios_row[indices]
+        resampled_els_cs_info._theta_rad = theta_rad[indices]
+        resampled_els_cs_info_list.append(resampled_els_cs_info)
+
+        interpolated_ratios = np.interp(theta_rad, theta_rad[indices], ratios_row[indices])
+        maximum_error = max(maximum_error, float(np.max(np.abs(interpolated_ratios - ratios_row))))
+
+    return resampled_els_cs_info_list, maximum_error
+
+
+def _segment_cdf_error(theta_rad, ratios, start, end):
+    weights = (theta_rad[start + 1:end] - theta_rad[start]) / (theta_rad[end] - theta_rad[start])
+    interpolated_ratios = ratios[:, start:start + 1] * (1.0 - weights) + ratios[:, end:end + 1] * weights
+    return np.max(np.abs(interpolated_ratios - ratios[:, start + 1:end]))
+
+
+def _iter_els_cs_info(file):
+    """
+    Yield the offset and the record of each record from the current position to the end of the file.
+    """
+    position = file.tell()
+    file.seek(0, os.SEEK_END)
+    file_size = file.tell()
+    file.seek(position)
+
+    while position < file_size:
+        els_cs_info = ElsepaCrossSectionInfo()
+        try:
+            els_cs_info.read_file(file)
+        except struct.error as message:
+            logging.error("Truncated ELSEPA record at byte %i of %i: %s", position, file_size, message)
+            return
+
+        yield position, els_cs_info
+        position = file.tell()
+
+
+def _scan_headers(file):
+    file.seek(0, os.SEEK_END)
+    file_size = file.tell()
+
+    offsets = []
+    energies_keV = []
+    total_cs_nm2 = []
+
+    offset = 0
+    while offset + HEADER_SIZE <= file_size:
+        file.seek(offset)
+        _file_version, _atomic_number, energy_keV, total_nm2, number_points = \
+            struct.unpack(HEADER_FORMAT, file.read(HEADER_SIZE))
+        record_size = HEADER_SIZE + number_points * POINT_DTYPE.itemsize
+        if offset + record_size > file_size:
+            logging.error("Truncated ELSEPA record at byte %i of %i: %i bytes expected", offset, file_size, record_size)
+            break
+
+        offsets.append(offset)
+        energies_keV.append(energy_keV)
+        total_cs_nm2.append(total_nm2)
+        offset += record_size
+
+    return np.array(offsets, dtype=np.int64), np.array(energies_keV), np.array(total_cs_nm2)
 
 
 class ElsepaBinaryFile:
-    def __init__(self, filepath):
+    """
+    ELSEPA binary file with all the records of one element.
+
+    By default all the records are read when the object is created. With `lazy=True`, the file is memory-mapped,
+    only the record headers are scanned to build an offset index and the angular data of a record is decoded the
+    first time it is accessed. The memory map is kept open until :py:meth:`close` is called, use the object as a
+    context manager to manage its lifetime.
+    """
+    def __init__(self, filepath, lazy=False):
         self._filepath = filepath
+        self._lazy = lazy
         self._els_cs_info_list = []
+        self._offsets = np.zeros(0, dtype=np.int64)
+        self._energies_keV = np.zeros(0)
+        self._total_cs_nm2 = np.zeros(0)
+        self._sorted_indices = np.zeros(0, dtype=np.int64)
+        self._sorted_energies_keV = np.zeros(0)
+        self._log_sorted_energies_keV = np.zeros(0)
+        self._log_total_cs_nm2 = np.zeros(0)
 
-        file = open(self._filepath, 'rb')
-        self.read_file(file)
+        self._file = None
+        self._buffer = None
+
+        if self._lazy:
+            self.open()
+        else:
+            with open(self._filepath, 'rb') as file:
+                self.read_file(file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._els_cs_info_list)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.get_els_cs_info(index)
+
+    @property
+    def energies_keV(self):
+        return self._energies_keV
+
+    @property
+    def total_cs_nm2(self):
+        return self._total_cs_nm2
+
+    def open(self):
+        self.close()
+
+        self._file = open(self._filepath, 'rb')
+        if os.path.getsize(self._filepath) > 0:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.read_index(self._buffer)
+        else:
+            self.read_index(self._file)
+
+    def close(self):
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
 
     def read_file(self, file):
         self._els_cs_info_list = []
-        while file:
-            try:
-                elsepa_cs_info = ElsepaCrossSectionInfo()
-                elsepa_cs_info.read_file(file)
-                self._els_cs_info_list.append(elsepa_cs_info)
-            except struct.error as message:
-                logging.error(message)
-                return
+        offsets = []
+        for offset, els_cs_info in _iter_els_cs_info(file):
+            self._els_cs_info_list.append(els_cs_info)
+            offsets.append(offset)
+
+        self._offsets = np.array(offsets, dtype=np.int64)
+        self._energies_keV = np.array([els_cs_info._energy_keV for els_cs_info in self._els_cs_info_list])
+        self._total_cs_nm2 = np.array([els_cs_info._total_cs_nm2 for els_cs_info in self._els_cs_info_list])
+        self._set_energy_index()
+
+    def read_index(self, file):
+        """
+        Scan the record headers of the file to build the offset index without decoding the angular data.
+        """
+        self._offsets, self._energies_keV, self._total_cs_nm2 = _scan_headers(file)
+        self._els_cs_info_list = [None] * len(self._offsets)
+        self._set_energy_index()
+
+    def _set_energy_index(self):
+        self._sorted_indices = np.argsort(self._energies_keV, kind="stable")
+        self._sorted_energies_keV = self._energies_keV[self._sorted_indices]
+        self._log_sorted_energies_keV = np.log(self._sorted_energies_keV)
+        self._log_total_cs_nm2 = np.log(self._total_cs_nm2)
+
+    def get_els_cs_info(self, index):
+        els_cs_info = self._els_cs_info_list[index]
+        if els_cs_info is None:
+            if self._buffer is None:
+                raise ValueError("ELSEPA file is closed: {}".format(self._filepath))
+
+            self._buffer.seek(int(self._offsets[index]))
+            els_cs_info = ElsepaCrossSectionInfo()
+            els_cs_info.read_file(self._buffer)
+            self._els_cs_info_list[index] = els_cs_info
+
+        return els_cs_info
+
+    def get_table(self):
+        """
+        Return all the records of the file as a columnar :py:class:`ElsepaTable`.
+        """
+        els_cs_info_list = [self.get_els_cs_info(index) for index in range(len(self))]
+        return ElsepaTable.from_els_cs_info_list(els_cs_info_list)
+
+    def get_offset(self, energy_keV):
+        return int(self._offsets[self._find_index(energy_keV)])
+
+    def get_els_cs_info_by_energy(self, energy_keV):
+        return self.get_els_cs_info(self._find_index(energy_keV))
+
+    def _find_index(self, energy_keV):
+        indices = np.flatnonzero(np.isclose(self._energies_keV, energy_keV, rtol=1.0e-12, atol=0.0))
+        if len(indices) == 0:
+            raise KeyError(energy_keV)
+        return int(indices[0])
+
+    def interpolate_total_cs_nm2(self, energies_keV, log_log=False):
+        """
+        Interpolate the total cross section at the energies without decoding the angular data.
+
+        :param energies_keV: energies in keV inside the tabulated range
+        :param bool log_log: interpolate in log(total) vs log(energy) instead of linearly
+        :return: the total cross sections in nm2 with the same shape as `energies_keV`
+        """
+        lower_indices, upper_indices, weights = self._bracket(energies_keV, log_log)
+        return self._interpolate_total_cs_nm2(lower_indices, upper_indices, weights, log_log)
+
+    def _interpolate_total_cs_nm2(self, lower_indices, upper_indices, weights, log_log):
+        if log_log:
+            log_totals = self._log_total_cs_nm2
+            return np.exp(log_totals[lower_indices] + weights * (log_totals[upper_indices] - log_totals[lower_indices]))
+        else:
+            totals = self._total_cs_nm2
+            return totals[lower_indices] + weights * (totals[upper_indices] - totals[lower_indices])
+
+    def interpolate(self, energies_keV, log_log=False):
+        """
+        Interpolate the total cross section and the angular cumulative distribution at the energies.
+
+        Only the records bracketing the energies are decoded. With `log_log=True`, the total is interpolated in
+        log-log and the angular rows are weighted with log(energy).
+
+        :param energies_keV: energies in keV inside the tabulated range
+        :param bool log_log: use log-log interpolation
+        :return: the totals in nm2 with the shape of `energies_keV`, the ratios and the theta in rad with one row of
+            `number_points` values for each energy
+        """
+        lower_indices, upper_indices, weights = self._bracket(energies_keV, log_log)
+        totals_nm2 = self._interpolate_total_cs_nm2(lower_indices, upper_indices, weights, log_log)
+
+        record_indices, positions = np.unique(np.concatenate((lower_indices.ravel(), upper_indices.ravel())),
+                                              return_inverse=True)
+        rows = [self.get_els_cs_info(int(index)) for index in record_indices]
+        number_points = {els_cs_info._number_points for els_cs_info in rows}
+        if len(number_points) != 1:
+            raise ValueError("Records with different number of points: {}".format(sorted(number_points)))
+
+        ratios = np.stack([els_cs_info._ratios for els_cs_info in rows])
+        thetas_rad = np.stack([els_cs_info._theta_rad for els_cs_info in rows])
+        lower_positions, upper_positions = np.split(positions, 2)
+        shape = weights.shape + (ratios.shape[1],)
+        weights = weights.reshape(-1, 1)
+
+        ratios = (1.0 - weights) * ratios[lower_positions] + weights * ratios[upper_positions]
+        thetas_rad = (1.0 - weights) * thetas_rad[lower_positions] + weights * thetas_rad[upper_positions]
+
+        return totals_nm2, ratios.reshape(shape), thetas_rad.reshape(shape)
+
+    def _bracket(self, energies_keV, log_log):
+        """
+        Find the records bracketing each energy in the sorted energy index and the interpolation weights.
+        """
+        if len(self._energies_keV) < 2:
+            raise ValueError("At least two records are needed to interpolate: {}".format(self._filepath))
+
+        rows, weights = bracket_energies(self._sorted_energies_keV, energies_keV, log_log,
+                                         self._log_sorted_energies_keV)
+
+        return self._sorted_indices[rows], self._sorted_indices[rows + 1], weights
@@ -25,15 +25,20 @@ Read ELSEPA CASINO files.
 ###############################################################################
 
 # Standard library modules.
+import io
+import threading
+from collections import OrderedDict, namedtuple
 from zipfile import ZipFile
 
 # Third party modules.
-from scipy.interpolate import interp1d
+import numpy as np
 
 # Local modules.
 
 # Project modules.
 from eecs.element_properties import get_symbol
+from eecs.models.interpolation import bracket_energies, interpolate_rows
+from eecs.models.elsepa_sampler import AngleSampler, AliasAngleSampler
 
 # Globals and constants variables.
 PREFIX_ANGLE = "A_"
@@ -41,149 +46,347 @@ PREFIX_PARTIAL = "P_"
 PREFIX_TOTAL = "T_"
 SUFFIX = ".txt"
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "elements", "memory_bytes"])
 
-class AngleElement:
-    def __init__(self, energies_keV, random_numbers, angles_deg):
-        self.angle_functions = {}
-        for row_id, energy_keV in enumerate(energies_keV):
-            self.angle_functions[energy_keV] = interp1d(random_numbers[row_id], angles_deg, kind='linear')
 
-    def __call__(self, energy_keV, random_number):
-        angle_deg = self.angle_functions[energy_keV](random_number)
-        return angle_deg
+def get_member_name(prefix, atomic_number):
+    symbol = get_symbol(atomic_number).capitalize()
+    return prefix + symbol + SUFFIX
 
 
-class PartialElement:
-    def __init__(self, energies_keV, angles_deg, partials_nm2_sr_2D):
-        self.partial_functions = {}
-        for row_id, energy_keV in enumerate(energies_keV):
-            self.partial_functions[energy_keV] = interp1d(angles_deg, partials_nm2_sr_2D[row_id], kind='linear')
+def read_table(data):
+    """
+    Parse a tab separated table of an A_, P_ or T_ member.
 
-    def __call__(self, energy_eV, angle_deg):
-        angle_deg = self.partial_functions[energy_eV](angle_deg)
-        return angle_deg
+    :param bytes data: content of the member with one header row
+    :return: the items of the header row and the values as a 2D array (rows x columns)
+    """
+    file = io.BytesIO(data)
+    header_items = file.readline().decode('ascii').strip().split('\t')
 
+    values = np.loadtxt(file, delimiter='\t', ndmin=2)
+    if values.shape[1] != len(header_items):
+        raise ValueError("Expected {:d} columns, got {:d}".format(len(header_items), values.shape[1]))
 
-class ElsepaCasino:
-    def __init__(self, zip_filepath):
-        self.zip_filepath = zip_filepath
+    return header_items, values
 
-        self.total_functions = {}
-        self.angle_functions = {}
-        self.partial_functions = {}
 
-    def read_total_data(self, atomic_number):
-        zip_file = ZipFile(self.zip_filepath, mode='r')
+class TotalElement:
+    """
+    Total cross section as function of the energy from the tabulated values.
 
-        symbol = get_symbol(atomic_number).capitalize()
-        name = PREFIX_TOTAL + symbol + SUFFIX
+    The values are interpolated linearly or, with `log_log=True`, linearly in log(total) vs log(energy) with the
+    logarithms computed once at construction. The total cross section is close to a power law of the energy, the
+    log-log interpolation is more accurate on a coarse energy grid.
+    """
+    def __init__(self, energies_eV, totals_nm2, log_log=False):
+        self.energies_eV = np.asarray(energies_eV, dtype=np.float64)
+        self.totals_nm2 = np.asarray(totals_nm2, dtype=np.float64)
+        self.log_log = log_log
 
-        lines = zip_file.read(name).decode('ascii').split('\r\n')
+        if log_log:
+            if np.any(self.energies_eV <= 0.0) or np.any(self.totals_nm2 <= 0.0):
+                raise ValueError("The energies and the totals must be positive for the log-log interpolation")
+            self.log_energies = np.log(self.energies_eV)
+            self.log_totals = np.log(self.totals_nm2)
 
-        energies_keV = []
-        totals_nm2 = []
+    def __call__(self, energy_eV):
+        if self.log_log:
+            log_totals = interpolate_rows(self.log_energies, self.log_totals, 0, np.log(energy_eV))
+            return np.exp(log_totals)
+        else:
+            return interpolate_rows(self.energies_eV, self.totals_nm2, 0, energy_eV)
 
-        for line in lines[1:]:
-            items = line.split('\t')
-            if len(items) > 0:
-                try:
-                    energy_keV = float(items[0])
-                    total_nm2 = float(items[1])
-                    energies_keV.append(energy_keV)
-                    totals_nm2.append(total_nm2)
-                except ValueError:
-                    pass
+    @property
+    def nbytes(self):
+        """
+        Memory used by the tables in bytes.
+        """
+        nbytes = self.energies_eV.nbytes + self.totals_nm2.nbytes
+        if self.log_log:
+            nbytes += self.log_energies.nbytes + self.log_totals.nbytes
+        return nbytes
 
-        self.total_functions[atomic_number] = interp1d(energies_keV, totals_nm2, kind='linear')
 
-    def read_angle_data(self, atomic_number):
-        zip_file = ZipFile(self.zip_filepath, mode='r')
+class AngleElement:
+    """
+    Scattering angle as function of the energy and a random number from the tabulated cumulative distributions.
+
+    Between two tabulated energies, the angles obtained with the two bracketing rows are interpolated linearly in
+    energy or in log(energy).
+    """
+    def __init__(self, energies_eV, random_numbers, angles_deg, log_energy=False):
+        self.energies_eV = np.asarray(energies_eV, dtype=np.float64)
+        self.random_numbers = np.asarray(random_numbers, dtype=np.float64)
+        self.angles_deg = np.asarray(angles_deg, dtype=np.float64)
+        self.log_energy = log_energy
+
+    def __call__(self, energy_eV, random_number):
+        energies_eV, random_numbers = np.broadcast_arrays(np.asarray(energy_eV, dtype=np.float64),
+                                                          np.asarray(random_number, dtype=np.float64))
+        rows, weights = bracket_energies(self.energies_eV, energies_eV, self.log_energy)
+
+        lower_angles_deg = interpolate_rows(self.random_numbers, self.angles_deg, rows, random_numbers)
+        upper_angles_deg = interpolate_rows(self.random_numbers, self.angles_deg, rows + 1, random_numbers)
+        angle_deg = lower_angles_deg + weights * (upper_angles_deg - lower_angles_deg)
+        return angle_deg
 
-        symbol = get_symbol(atomic_number).capitalize()
-        name = PREFIX_ANGLE + symbol + SUFFIX
+    @property
+    def nbytes(self):
+        """
+        Memory used by the tables in bytes.
+        """
+        return self.energies_eV.nbytes + self.random_numbers.nbytes + self.angles_deg.nbytes
 
-        lines = zip_file.read(name).decode('ascii').split('\r\n')
 
-        energies_keV = []
-        random_numbers_2D = []
+class PartialElement:
+    """
+    Partial cross section as function of the energy and the angle from the tabulated rows.
+
+    Between two tabulated energies, the values of the two bracketing rows are interpolated linearly in energy or in
+    log(energy).
+    """
+    def __init__(self, energies_eV, angles_deg, partials_nm2_sr_2D, log_energy=False):
+        self.energies_eV = np.asarray(energies_eV, dtype=np.float64)
+        self.angles_deg = np.asarray(angles_deg, dtype=np.float64)
+        self.partials_nm2_sr = np.asarray(partials_nm2_sr_2D, dtype=np.float64)
+        self.log_energy = log_energy
 
-        line = lines[0]
-        angles_deg = [float(angle_deg) for angle_deg in line.split('\t')[1:]]
+    def __call__(self, energy_eV, angle_deg):
+        energies_eV, angles_deg = np.broadcast_arrays(np.asarray(energy_eV, dtype=np.float64),
+                                                      np.asarray(angle_deg, dtype=np.float64))
+        rows, weights = bracket_energies(self.energies_eV, energies_eV, self.log_energy)
 
-        for line in lines[1:]:
-            items = line.strip().split('\t')
-            if len(items) > 0:
-                try:
-                    energy_keV = float(items[0])
-                    random_numbers = []
-                    for item in items[1:]:
-                        random_number = float(item)
-                        random_numbers.append(random_number)
+        lower_partials_nm2_sr = interpolate_rows(self.angles_deg, self.partials_nm2_sr, rows, angles_deg)
+        upper_partials_nm2_sr = interpolate_rows(self.angles_deg, self.partials_nm2_sr, rows + 1, angles_deg)
+        partial_nm2_sr = lower_partials_nm2_sr + weights * (upper_partials_nm2_sr - lower_partials_nm2_sr)
+        return partial_nm2_sr
 
-                    energies_keV.append(energy_keV)
-                    random_numbers_2D.append(random_numbers)
-                except ValueError:
-                    pass
+    @property
+    def nbytes(self):
+        """
+        Memory used by the tables in bytes.
+        """
+        return self.energies_eV.nbytes + self.angles_deg.nbytes + self.partials_nm2_sr.nbytes
 
-        assert len(energies_keV) == len(random_numbers_2D)
-        assert len(angles_deg) == len(random_numbers_2D[0])
-        assert len(angles_deg) == len(random_numbers_2D[-1])
 
-        self.angle_functions[atomic_number] = AngleElement(energies_keV, random_numbers_2D, angles_deg)
+class ElsepaCasino:
+    """
+    ELSEPA cross sections tabulated for CASINO in a zip archive with the T_, A_ and P_ files of each element.
 
-    def read_partial_data(self, atomic_number):
-        zip_file = ZipFile(self.zip_filepath, mode='r')
+    Between the tabulated energies, the angle and partial data are interpolated linearly in energy or, with
+    `log_energy=True`, in log(energy). The total cross section is interpolated linearly or, with `log_log=True`, in
+    log-log.
 
-        symbol = get_symbol(atomic_number).capitalize()
-        name = PREFIX_PARTIAL + symbol + SUFFIX
+    The archive is opened on the first read and kept open until :py:meth:`close` is called, use the object as a
+    context manager to manage its lifetime.
 
-        lines = zip_file.read(name).decode('ascii').split('\r\n')
+    An instance can be shared between threads: the data of an element is read once, concurrent first accesses to the
+    same element wait for that single read.
 
-        energies_keV = []
-        partials_nm2_sr_2D = []
+    The tables of the elements are kept in memory until the cache exceeds `maximum_elements` elements or
+    `maximum_memory_bytes` bytes, then the least recently used elements are evicted and read again on their next
+    access. The most recently used element is always kept. The cache statistics are given by :py:meth:`cache_info`.
+    """
+    def __init__(self, zip_filepath, log_energy=False, maximum_elements=None, maximum_memory_bytes=None,
+                 log_log=False):
+        self.zip_filepath = zip_filepath
+        self.log_energy = log_energy
+        self.log_log = log_log
+        self.maximum_elements = maximum_elements
+        self.maximum_memory_bytes = maximum_memory_bytes
+        self._zip_file = None
+        self._lock = threading.Lock()
+        self._element_locks = {}
+
+        self._element_nbytes = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
 
-        line = lines[0]
-        angles_deg = [float(angle_deg) for angle_deg in line.split('\t')[1:]]
+        self.total_functions = {}
+        self.angle_functions = {}
+        self.partial_functions = {}
 
-        for line in lines[1:]:
-            items = line.strip().split('\t')
-            if len(items) > 0:
-                try:
-                    energy_keV = float(items[0])
-                    partials_nm2_sr = []
-                    for item in items[1:]:
-                        partial_nm2_sr = float(item)
-                        partials_nm2_sr.append(partial_nm2_sr)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        with self._lock:
+            if self._zip_file is None:
+                self._zip_file = ZipFile(self.zip_filepath, mode='r')
+            return self._zip_file
+
+    def close(self):
+        with self._lock:
+            if self._zip_file is not None:
+                self._zip_file.close()
+                self._zip_file = None
+
+    def _get_element_lock(self, atomic_number):
+        with self._lock:
+            return self._element_locks.setdefault(atomic_number, threading.Lock())
+
+    def _get_element_function(self, functions, read_data, atomic_number):
+        """
+        Return the function of the element, reading its data once with double-checked locking.
+        """
+        function = functions.get(atomic_number)
+        if function is not None:
+            self._record_hit(atomic_number)
+            return function
+
+        with self._get_element_lock(atomic_number):
+            function = functions.get(atomic_number)
+            if function is not None:
+                self._record_hit(atomic_number)
+                return function
+
+            with self._lock:
+                self._misses += 1
+            return read_data(atomic_number)
+
+    def _record_hit(self, atomic_number):
+        with self._lock:
+            self._hits += 1
+            if atomic_number in self._element_nbytes:
+                self._element_nbytes.move_to_end(atomic_number)
+
+    def _update_cache(self, atomic_number):
+        """
+        Account the memory of the element as most recently used and evict the least recently used elements over the
+        budget.
+        """
+        with self._lock:
+            self._element_nbytes[atomic_number] = sum(functions[atomic_number].nbytes
+                                                      for functions in self._get_functions_list()
+                                                      if atomic_number in functions)
+            self._element_nbytes.move_to_end(atomic_number)
+
+            while len(self._element_nbytes) > 1 and self._is_over_budget():
+                evicted_atomic_number, _nbytes = self._element_nbytes.popitem(last=False)
+                for functions in self._get_functions_list():
+                    functions.pop(evicted_atomic_number, None)
+                self._evictions += 1
+
+    def _get_functions_list(self):
+        return [self.total_functions, self.angle_functions, self.partial_functions]
+
+    def _is_over_budget(self):
+        if self.maximum_elements is not None and len(self._element_nbytes) > self.maximum_elements:
+            return True
+        if self.maximum_memory_bytes is not None and sum(self._element_nbytes.values()) > self.maximum_memory_bytes:
+            return True
+        return False
+
+    def cache_info(self):
+        """
+        Return the cache statistics.
+
+        :return: :py:class:`CacheInfo` with the number of hits, misses and evictions, the number of cached elements and
+            their approximate memory in bytes
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, len(self._element_nbytes),
+                             sum(self._element_nbytes.values()))
+
+    def load_element(self, atomic_number):
+        """
+        Read the total, angle and partial data of the element from the archive in one pass.
+        """
+        zip_file = self.open()
+        with self._get_element_lock(atomic_number):
+            total_data = zip_file.read(get_member_name(PREFIX_TOTAL, atomic_number))
+            angle_data = zip_file.read(get_member_name(PREFIX_ANGLE, atomic_number))
+            partial_data = zip_file.read(get_member_name(PREFIX_PARTIAL, atomic_number))
+
+            self._set_total_data(atomic_number, total_data)
+            self._set_angle_data(atomic_number, angle_data)
+            self._set_partial_data(atomic_number, partial_data)
+
+    def _read_member(self, prefix, atomic_number):
+        return self.open().read(get_member_name(prefix, atomic_number))
 
-                    energies_keV.append(energy_keV)
-                    partials_nm2_sr_2D.append(partials_nm2_sr)
-                except ValueError:
-                    pass
+    def read_total_data(self, atomic_number):
+        return self._set_total_data(atomic_number, self._read_member(PREFIX_TOTAL, atomic_number))
 
-        assert len(energies_keV) == len(partials_nm2_sr_2D)
-        assert len(angles_deg) == len(partials_nm2_sr_2D[0])
-        assert len(angles_deg) == len(partials_nm2_sr_2D[-1])
+    def _set_total_data(self, atomic_number, data):
+        _header_items, values = read_table(data)
+        energies_eV = values[:, 0]
+        totals_nm2 = values[:, 1]
 
-        self.partial_functions[atomic_number] = PartialElement(energies_keV, angles_deg, partials_nm2_sr_2D)
+        total_element = TotalElement(energies_eV, totals_nm2, self.log_log)
+        self.total_functions[atomic_number] = total_element
+        self._update_cache(atomic_number)
+        return total_element
 
-    def total_nm2(self, atomic_number, energy_eV):
-        if atomic_number not in self.total_functions:
-            self.read_total_data(atomic_number)
+    def read_angle_data(self, atomic_number):
+        return self._set_angle_data(atomic_number, self._read_member(PREFIX_ANGLE, atomic_number))
+
+    def _set_angle_data(self, atomic_number, data):
+        header_items, values = read_table(data)
+        angles_deg = np.array(header_items[1:], dtype=np.float64)
+        energies_eV = values[:, 0]
+        random_numbers_2D = values[:, 1:]
+
+        angle_element = AngleElement(energies_eV, random_numbers_2D, angles_deg, self.log_energy)
+        self.angle_functions[atomic_number] = angle_element
+        self._update_cache(atomic_number)
+        return angle_element
+
+    def read_partial_data(self, atomic_number):
+        return self._set_partial_data(atomic_number, self._read_member(PREFIX_PARTIAL, atomic_number))
+
+    def _set_partial_data(self, atomic_number, data):
+        header_items, values = read_table(data)
+        angles_deg = np.array(header_items[1:], dtype=np.float64)
+        energies_eV = values[:, 0]
+        partials_nm2_sr_2D = values[:, 1:]
+
+        partial_element = PartialElement(energies_eV, angles_deg, partials_nm2_sr_2D, self.log_energy)
+        self.partial_functions[atomic_number] = partial_element
+        self._update_cache(atomic_number)
+        return partial_element
+
+    def angle_sampler(self, atomic_number, number_guides=None):
+        """
+        Create a vectorized :py:class:`AngleSampler` of the polar angle from the angle data of the element.
+        """
+        angle_element = self._get_element_function(self.angle_functions, self.read_angle_data, atomic_number)
+        return AngleSampler(angle_element.energies_eV, angle_element.random_numbers, angle_element.angles_deg,
+                            number_guides, angle_element.log_energy)
+
+    def alias_angle_sampler(self, atomic_number):
+        """
+        Create a vectorized :py:class:`AliasAngleSampler` of the polar angle from the partial data of the element.
+        """
+        partial_element = self._get_element_function(self.partial_functions, self.read_partial_data, atomic_number)
+        return AliasAngleSampler(partial_element.energies_eV, partial_element.angles_deg,
+                                 partial_element.partials_nm2_sr, partial_element.log_energy)
+
+    def total_element(self, atomic_number):
+        """
+        Return the :py:class:`TotalElement` with the tabulated total cross sections of the element.
+        """
+        return self._get_element_function(self.total_functions, self.read_total_data, atomic_number)
 
-        total_nm2 = self.total_functions[atomic_number](energy_eV)
+    def total_nm2(self, atomic_number, energy_eV):
+        """
+        Total cross section in nm2 of the element at the energies, scalar or array, inside the tabulated range.
+        """
+        total_nm2 = self.total_element(atomic_number)(energy_eV)
 
         return total_nm2
 
     def angle_deg(self, atomic_number, energy_eV, random_number):
-        if atomic_number not in self.angle_functions:
-            self.read_angle_data(atomic_number)
-
-        angle_deg = self.angle_functions[atomic_number](energy_eV, random_number)
+        angle_function = self._get_element_function(self.angle_functions, self.read_angle_data, atomic_number)
+        angle_deg = angle_function(energy_eV, random_number)
         return angle_deg
 
     def partial_nm2_sr(self, atomic_number, energy_eV, angle_deg):
-        if atomic_number not in self.partial_functions:
-            self.read_partial_data(atomic_number)
-
-        partial_nm2_sr = self.partial_functions[atomic_number](energy_eV, angle_deg)
+        partial_function = self._get_element_function(self.partial_functions, self.read_partial_data, atomic_number)
+        partial_nm2_sr = partial_function(energy_eV, angle_deg)
         return partial_nm2_sr
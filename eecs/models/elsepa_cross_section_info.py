@@ -25,8 +25,10 @@ Description
 ###############################################################################
 
 # Standard library modules.
+import struct
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 from casinotools.file_format.file_reader_writer_tools import read_int, read_double
@@ -34,9 +36,15 @@ from casinotools.file_format.file_reader_writer_tools import read_int, read_doub
 # Project modules.
 
 # Globals and constants variables.
+POINT_DTYPE = np.dtype([("ratio", "<f8"), ("theta_rad", "<f8")])
+HEADER_START_FORMAT = "<iddd"
+NUMBER_POINTS_FORMAT = "<i"
 
 
 class ElsepaCrossSectionInfo:
+    __slots__ = ("_file_version", "_atomic_number", "_energy_keV", "_total_cs_nm2",
+                 "_number_points", "_ratios", "_theta_rad")
+
     def __init__(self):
         self._file_version = None
         self._atomic_number = None
@@ -54,14 +62,33 @@ class ElsepaCrossSectionInfo:
         self._total_cs_nm2 = read_double(file)
 
         self._number_points = read_int(file)
-        self._ratios = []
-        self._theta_rad = []
-        for dummy in range(self._number_points):
-            ratio = read_double(file)
-            theta_rad = read_double(file)
-
-            self._ratios.append(ratio)
-            self._theta_rad.append(theta_rad)
+        self._read_points(file)
 
         assert len(self._ratios) == self._number_points
         assert len(self._theta_rad) == self._number_points
+
+    def write_file(self, file):
+        """
+        Write the record with the same binary layout as :py:meth:`read_file`.
+        """
+        file.write(struct.pack(HEADER_START_FORMAT, self._file_version, float(self._atomic_number),
+                               self._energy_keV, self._total_cs_nm2))
+        file.write(struct.pack(NUMBER_POINTS_FORMAT, self._number_points))
+
+        points = np.empty(self._number_points, dtype=POINT_DTYPE)
+        points["ratio"] = self._ratios
+        points["theta_rad"] = self._theta_rad
+        file.write(points.tobytes())
+
+    def _read_points(self, file):
+        """
+        Decode the (ratio, theta) block of the record in one read using the number of points.
+        """
+        number_bytes = self._number_points * POINT_DTYPE.itemsize
+        data = file.read(number_bytes)
+        if len(data) != number_bytes:
+            raise struct.error("unpack requires a buffer of {:d} bytes".format(number_bytes))
+
+        points = np.frombuffer(data, dtype=POINT_DTYPE, count=self._number_points)
+        self._ratios = points["ratio"].astype(np.float64)
+        self._theta_rad = points["theta_rad"].astype(np.float64)
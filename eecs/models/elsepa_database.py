@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: eecs.models.elsepa_database
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Load the ELSEPA binary files EL{Z}.els of an element database directory.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+
+# Standard library modules.
+import os
+import os.path
+import logging
+import time
+import json
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+from eecs.models.elsepa_binary_file import ElsepaBinaryFile
+from eecs.models.elsepa_table import ElsepaTable
+
+# Globals and constants variables.
+ELSEPA_FILENAME = "EL{:d}.els"
+CACHE_VERSION = 1
+
+
+def get_elsepa_filepath(path, atomic_number):
+    return os.path.join(path, ELSEPA_FILENAME.format(int(atomic_number)))
+
+
+def load_tables(path, atomic_numbers, number_workers=None, use_threads=False, cache_filepath=None):
+    """
+    Load the ELSEPA binary files of the elements from a database directory concurrently.
+
+    With a cache file, the tables of the elements whose source file has the same path, size and modification time
+    as when the cache was written are read from the cache without parsing. The other files are parsed and the cache
+    is rewritten.
+
+    :param str path: directory with the EL{Z}.els files
+    :param atomic_numbers: atomic numbers of the elements to load
+    :param int number_workers: number of workers of the pool, default to the executor default (number of cores)
+    :param bool use_threads: use a thread pool instead of a process pool
+    :param str cache_filepath: optional consolidated cache file (.npz)
+    :return: the :py:class:`ElsepaTable` of each atomic number and the load time in second of each parsed file
+    """
+    atomic_numbers = sorted(set(int(atomic_number) for atomic_number in atomic_numbers))
+    filepaths = {atomic_number: get_elsepa_filepath(path, atomic_number) for atomic_number in atomic_numbers}
+
+    tables = {}
+    times_s = {}
+
+    if cache_filepath is not None:
+        sources = {atomic_number: get_source_key(filepaths[atomic_number]) for atomic_number in atomic_numbers}
+        cached_tables, cached_sources = read_cache(cache_filepath, atomic_numbers)
+        for atomic_number in atomic_numbers:
+            if atomic_number in cached_tables and cached_sources[atomic_number] == sources[atomic_number]:
+                tables[atomic_number] = cached_tables[atomic_number]
+
+    parsed_atomic_numbers = [atomic_number for atomic_number in atomic_numbers if atomic_number not in tables]
+    if len(parsed_atomic_numbers) == 0:
+        return tables, times_s
+
+    executor_class = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    parsed_filepaths = [filepaths[atomic_number] for atomic_number in parsed_atomic_numbers]
+    with executor_class(max_workers=number_workers) as executor:
+        for atomic_number, (table, time_s) in zip(parsed_atomic_numbers, executor.map(_load_table, parsed_filepaths)):
+            tables[atomic_number] = table
+            times_s[atomic_number] = time_s
+            logging.info("Loaded %s in %.3f s", filepaths[atomic_number], time_s)
+
+    if cache_filepath is not None:
+        cached_tables, cached_sources = read_cache(cache_filepath)
+        for atomic_number in parsed_atomic_numbers:
+            cached_tables[atomic_number] = tables[atomic_number]
+            cached_sources[atomic_number] = sources[atomic_number]
+        write_cache(cache_filepath, cached_tables, cached_sources)
+
+    return tables, times_s
+
+
+def get_source_key(filepath):
+    """
+    Return the key used to detect if a source file changed since the cache was written.
+    """
+    file_stat = os.stat(filepath)
+    return {"path": os.path.abspath(filepath), "size": file_stat.st_size, "mtime_ns": file_stat.st_mtime_ns}
+
+
+def read_cache(cache_filepath, atomic_numbers=None):
+    """
+    Read the tables of a consolidated cache file.
+
+    Only the arrays of the requested elements are read from the file.
+
+    :param atomic_numbers: atomic numbers of the elements to read, all the cached elements when None
+    :return: the tables and the source keys of each atomic number, empty when the cache file is missing or invalid
+    """
+    tables = {}
+    sources = {}
+    if not os.path.isfile(cache_filepath):
+        return tables, sources
+
+    try:
+        with np.load(cache_filepath, allow_pickle=False) as data:
+            metadata = json.loads(str(data["metadata"]))
+            if metadata["version"] != CACHE_VERSION:
+                logging.info("Ignore cache with version %s: %s", metadata["version"], cache_filepath)
+                return tables, sources
+
+            for key, source in metadata["sources"].items():
+                atomic_number = int(key)
+                if atomic_numbers is not None and atomic_number not in atomic_numbers:
+                    continue
+                arrays = {name: data[_get_cache_key(atomic_number, name)] for name in ElsepaTable.ARRAY_NAMES}
+                tables[atomic_number] = ElsepaTable.from_arrays(atomic_number, arrays)
+                sources[atomic_number] = source
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as message:
+        logging.warning("Ignore invalid cache %s: %s", cache_filepath, message)
+        return {}, {}
+
+    return tables, sources
+
+
+def write_cache(cache_filepath, tables, sources):
+    """
+    Write the tables in one uncompressed .npz file with the source key of each table.
+    """
+    metadata = {"version": CACHE_VERSION,
+                "sources": {str(atomic_number): sources[atomic_number] for atomic_number in sorted(tables)}}
+    arrays = {"metadata": np.array(json.dumps(metadata))}
+    for atomic_number, table in tables.items():
+        for name, values in table.to_arrays().items():
+            arrays[_get_cache_key(atomic_number, name)] = values
+
+    temporary_filepath = "{}.{:d}.tmp".format(cache_filepath, os.getpid())
+    with open(temporary_filepath, 'wb') as file:
+        np.savez(file, **arrays)
+    os.replace(temporary_filepath, cache_filepath)
+
+
+def _get_cache_key(atomic_number, name):
+    return "Z{:d}_{}".format(atomic_number, name)
+
+
+def _load_table(filepath):
+    start_time_s = time.perf_counter()
+    table = ElsepaBinaryFile(filepath).get_table()
+    time_s = time.perf_counter() - start_time_s
+
+    return table, time_s
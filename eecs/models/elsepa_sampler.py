@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: eecs.models.elsepa_sampler
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Vectorized samplers of the elastic scattering angle from the ELSEPA CASINO tables.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+from eecs.models.interpolation import bracket_energies
+
+# Globals and constants variables.
+
+
+class AngleSampler:
+    """
+    Inverse cumulative distribution sampler of the polar angle using equal probability guide tables.
+
+    For each energy row, the guide table gives for each of the `number_guides` equal probability intervals the
+    last angular interval whose cumulative probability is below the interval start. The angular interval of a sample
+    is searched by bisection only between the guide entries bounding its random number, instead of over all the
+    angles.
+
+    Between two tabulated energies, the angles of the two bracketing rows are interpolated like in
+    :py:class:`eecs.models.elsepa_casino.AngleElement`.
+    """
+    def __init__(self, energies_eV, random_numbers, angles_deg, number_guides=None, log_energy=False):
+        self.energies_eV = np.asarray(energies_eV, dtype=np.float64)
+        self.random_numbers = np.asarray(random_numbers, dtype=np.float64)
+        self.angles_deg = np.asarray(angles_deg, dtype=np.float64)
+        self.log_energy = log_energy
+
+        number_points = len(self.angles_deg)
+        if self.random_numbers.shape != (len(self.energies_eV), number_points):
+            raise ValueError("Expected random numbers with shape {}, got {}".format(
+                (len(self.energies_eV), number_points), self.random_numbers.shape))
+
+        if number_guides is None:
+            number_guides = number_points
+        self.number_guides = number_guides
+
+        thresholds = np.arange(number_guides) / number_guides
+        self.guides = np.empty((len(self.energies_eV), number_guides), dtype=np.intp)
+        for row_id, random_numbers_row in enumerate(self.random_numbers):
+            guides = np.searchsorted(random_numbers_row, thresholds, side='right') - 1
+            self.guides[row_id] = np.clip(guides, 0, number_points - 2)
+        self._upper_guides = np.concatenate((self.guides[:, 1:], np.full((len(self.energies_eV), 1), number_points - 2,
+                                                                         dtype=np.intp)), axis=1)
+
+    def sample(self, energies_eV, rng=None, random_numbers=None):
+        """
+        Sample one polar angle for each energy.
+
+        :param energies_eV: energies of the electrons in eV
+        :param rng: :py:class:`numpy.random.Generator` used when `random_numbers` is not given
+        :param random_numbers: optional pre-drawn uniform random numbers with the shape of `energies_eV`
+        :return: the polar angles in degree
+        """
+        energies_eV = np.asarray(energies_eV, dtype=np.float64)
+        if random_numbers is None:
+            if rng is None:
+                rng = np.random.default_rng()
+            random_numbers = rng.random(energies_eV.shape)
+        energies_eV, random_numbers = np.broadcast_arrays(energies_eV, np.asarray(random_numbers, dtype=np.float64))
+
+        rows, weights = bracket_energies(self.energies_eV, energies_eV.ravel(), self.log_energy)
+        random_numbers = random_numbers.ravel()
+
+        lower_angles_deg = self._invert(rows, random_numbers)
+        upper_angles_deg = self._invert(rows + 1, random_numbers)
+        angles_deg = lower_angles_deg + weights * (upper_angles_deg - lower_angles_deg)
+        return angles_deg.reshape(energies_eV.shape)
+
+    def _invert(self, rows, random_numbers):
+        guide_ids = np.minimum((random_numbers * self.number_guides).astype(np.intp), self.number_guides - 1)
+        indices = self.guides[rows, guide_ids]
+        upper_indices = self._upper_guides[rows, guide_ids]
+
+        active = np.flatnonzero(indices < upper_indices)
+        while len(active) > 0:
+            middle_indices = (indices[active] + upper_indices[active] + 1) // 2
+            below = self.random_numbers[rows[active], middle_indices] <= random_numbers[active]
+            indices[active] = np.where(below, middle_indices, indices[active])
+            upper_indices[active] = np.where(below, upper_indices[active], middle_indices - 1)
+            active = active[indices[active] < upper_indices[active]]
+
+        lower_random_numbers = self.random_numbers[rows, indices]
+        delta_random_numbers = self.random_numbers[rows, indices + 1] - lower_random_numbers
+        fractions = np.divide(random_numbers - lower_random_numbers, delta_random_numbers,
+                              out=np.zeros(len(random_numbers)), where=delta_random_numbers > 0.0)
+
+        lower_angles_deg = self.angles_deg[indices]
+        return lower_angles_deg + fractions * (self.angles_deg[indices + 1] - lower_angles_deg)
+
+
+class AliasAngleSampler:
+    """
+    Walker alias sampler of the polar angle over the angular bins of the tabulated partial cross sections.
+
+    For each energy row, the probability of the bin between two tabulated angles is proportional to
+    dσ/dΩ sin(θ) Δθ, with dσ/dΩ averaged over the bin edges, and the angle is uniform inside the chosen bin. When all
+    the energies are tabulated energies, a sample costs two uniform random numbers and one comparison: the first random
+    number selects the bin and, with its fractional part, the bin or its alias; the second one gives the position
+    inside the bin.
+
+    When an energy is between two tabulated energies, one of the two bracketing rows is selected randomly with the
+    interpolation weight, which costs a third random number for every sample of the batch.
+    """
+    def __init__(self, energies_eV, angles_deg, partials_nm2_sr, log_energy=False):
+        self.energies_eV = np.asarray(energies_eV, dtype=np.float64)
+        self.angles_deg = np.asarray(angles_deg, dtype=np.float64)
+        partials_nm2_sr = np.asarray(partials_nm2_sr, dtype=np.float64)
+        self.log_energy = log_energy
+
+        if partials_nm2_sr.shape != (len(self.energies_eV), len(self.angles_deg)):
+            raise ValueError("Expected partials with shape {}, got {}".format(
+                (len(self.energies_eV), len(self.angles_deg)), partials_nm2_sr.shape))
+
+        self.lower_angles_deg = self.angles_deg[:-1]
+        self.widths_deg = np.diff(self.angles_deg)
+        self.weights = compute_bin_weights(self.angles_deg, partials_nm2_sr)
+
+        self.probabilities = np.empty(self.weights.shape)
+        self.aliases = np.empty(self.weights.shape, dtype=np.intp)
+        for row_id, weights in enumerate(self.weights):
+            self.probabilities[row_id], self.aliases[row_id] = create_alias_table(weights)
+
+    @property
+    def number_bins(self):
+        return len(self.widths_deg)
+
+    def sample(self, energies_eV, rng=None):
+        """
+        Sample one polar angle for each energy.
+
+        :param energies_eV: energies of the electrons in eV
+        :param rng: :py:class:`numpy.random.Generator`
+        :return: the polar angles in degree
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        energies_eV = np.asarray(energies_eV, dtype=np.float64)
+        rows, weights = bracket_energies(self.energies_eV, energies_eV, self.log_energy)
+        if np.any(weights > 0.0):
+            rows = rows + (rng.random(energies_eV.shape) < weights)
+
+        positions = rng.random(energies_eV.shape) * self.number_bins
+        bins = np.minimum(positions.astype(np.intp), self.number_bins - 1)
+        bins = np.where(positions - bins < self.probabilities[rows, bins], bins, self.aliases[rows, bins])
+
+        return self.lower_angles_deg[bins] + rng.random(energies_eV.shape) * self.widths_deg[bins]
+
+
+def compute_bin_weights(angles_deg, partials_nm2_sr):
+    """
+    Compute the unnormalized probability dσ/dΩ sin(θ) Δθ of each angular bin of each row.
+    """
+    angles_rad = np.radians(angles_deg)
+    middle_angles_rad = 0.5 * (angles_rad[:-1] + angles_rad[1:])
+    middle_partials_nm2_sr = 0.5 * (partials_nm2_sr[..., :-1] + partials_nm2_sr[..., 1:])
+
+    return middle_partials_nm2_sr * np.sin(middle_angles_rad) * np.diff(angles_rad)
+
+
+def create_alias_table(weights):
+    """
+    Create the Walker alias table of a discrete distribution with Vose's method.
+
+    :param weights: non-negative unnormalized probabilities
+    :return: the probability to keep each bin and the alias of each bin
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    total = np.sum(weights)
+    if not total > 0.0:
+        raise ValueError("The sum of the weights must be positive")
+
+    number_bins = len(weights)
+    scaled_probabilities = weights * number_bins / total
+    probabilities = np.ones(number_bins)
+    aliases = np.arange(number_bins)
+
+    small_bins = [bin_id for bin_id in range(number_bins) if scaled_probabilities[bin_id] < 1.0]
+    large_bins = [bin_id for bin_id in range(number_bins) if scaled_probabilities[bin_id] >= 1.0]
+    while small_bins and large_bins:
+        small_bin = small_bins.pop()
+        large_bin = large_bins.pop()
+
+        probabilities[small_bin] = scaled_probabilities[small_bin]
+        aliases[small_bin] = large_bin
+
+        scaled_probabilities[large_bin] += scaled_probabilities[small_bin] - 1.0
+        if scaled_probabilities[large_bin] < 1.0:
+            small_bins.append(large_bin)
+        else:
+            large_bins.append(large_bin)
+
+    return probabilities, aliases
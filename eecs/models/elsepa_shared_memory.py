@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: eecs.models.elsepa_shared_memory
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Share ELSEPA tables between processes without copy.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+
+# Standard library modules.
+from multiprocessing.shared_memory import SharedMemory
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+from eecs.models.elsepa_table import ElsepaTable
+
+# Globals and constants variables.
+DTYPE = np.dtype(np.float64)
+
+
+class SharedElsepaTables:
+    """
+    Publish ELSEPA tables in one shared memory block.
+
+    The :py:attr:`descriptor` is a small picklable object to send to the worker processes, which attach the tables
+    with :py:class:`AttachedElsepaTables`. The publisher owns the block: use it as a context manager or call
+    :py:meth:`close` and :py:meth:`unlink` when the workers are done.
+    """
+    def __init__(self, tables, name=None):
+        layout = []
+        size = 0
+        for atomic_number in sorted(tables):
+            for array_name, values in tables[atomic_number].to_arrays().items():
+                layout.append((atomic_number, array_name, size, values.shape))
+                size += values.size * DTYPE.itemsize
+
+        self._shared_memory = SharedMemory(name=name, create=True, size=max(size, 1))
+        self.descriptor = (self._shared_memory.name, tuple(layout))
+
+        for atomic_number, array_name, offset, shape in layout:
+            values = np.ndarray(shape, dtype=DTYPE, buffer=self._shared_memory.buf, offset=offset)
+            values[...] = getattr(tables[atomic_number], array_name)
+            del values
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        self.unlink()
+
+    @property
+    def name(self):
+        return self._shared_memory.name
+
+    def close(self):
+        self._shared_memory.close()
+
+    def unlink(self):
+        self._shared_memory.unlink()
+
+
+class AttachedElsepaTables:
+    """
+    Read-only ELSEPA tables attached to a shared memory block published by :py:class:`SharedElsepaTables`.
+
+    The arrays of the tables are views of the shared memory, no data is copied. All references to the tables must
+    be released before :py:meth:`close` is called.
+    """
+    def __init__(self, descriptor):
+        name, layout = descriptor
+        self._shared_memory = _attach_shared_memory(name)
+
+        arrays = {}
+        for atomic_number, array_name, offset, shape in layout:
+            values = np.ndarray(shape, dtype=DTYPE, buffer=self._shared_memory.buf, offset=offset)
+            values.flags.writeable = False
+            arrays.setdefault(atomic_number, {})[array_name] = values
+
+        self.tables = {atomic_number: ElsepaTable.from_arrays(atomic_number, arrays[atomic_number])
+                       for atomic_number in arrays}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getitem__(self, atomic_number):
+        return self.tables[atomic_number]
+
+    def __contains__(self, atomic_number):
+        return atomic_number in self.tables
+
+    def __len__(self):
+        return len(self.tables)
+
+    def close(self):
+        self.tables = {}
+        self._shared_memory.close()
+
+
+def _attach_shared_memory(name):
+    try:
+        # The publisher owns the block, do not let the resource tracker of the worker unlink it (Python >= 3.13).
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        return SharedMemory(name=name)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: eecs.models.elsepa_table
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Columnar table of the ELSEPA cross sections of one element.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+
+# Globals and constants variables.
+
+
+class ElsepaTable:
+    """
+    Columnar representation of the ELSEPA records of one element sorted by energy.
+
+    The ratios are stored in a 2D array (number of energies x number of points). When all the records share the
+    same angular grid, only one theta vector is kept, otherwise theta is a 2D array with the same shape as the
+    ratios.
+    """
+    __slots__ = ("_atomic_number", "_energies_keV", "_total_cs_nm2", "_ratios", "_theta_rad")
+
+    ARRAY_NAMES = ("energies_keV", "total_cs_nm2", "ratios", "theta_rad")
+
+    def __init__(self, atomic_number, energies_keV, total_cs_nm2, ratios, theta_rad):
+        self._atomic_number = atomic_number
+        self._energies_keV = np.asarray(energies_keV, dtype=np.float64)
+        self._total_cs_nm2 = np.asarray(total_cs_nm2, dtype=np.float64)
+        self._ratios = np.asarray(ratios, dtype=np.float64)
+        self._theta_rad = np.asarray(theta_rad, dtype=np.float64)
+
+        number_energies = len(self._energies_keV)
+        if self._total_cs_nm2.shape != (number_energies,):
+            raise ValueError("Expected {:d} totals, got shape {}".format(number_energies, self._total_cs_nm2.shape))
+        if self._ratios.ndim != 2 or self._ratios.shape[0] != number_energies:
+            raise ValueError("Expected {:d} rows of ratios, got shape {}".format(number_energies, self._ratios.shape))
+        if self._theta_rad.shape not in [self._ratios.shape[1:], self._ratios.shape]:
+            raise ValueError("Theta shape {} does not match ratios shape {}".format(self._theta_rad.shape,
+                                                                                    self._ratios.shape))
+
+    @classmethod
+    def from_els_cs_info_list(cls, els_cs_info_list):
+        els_cs_info_list = sorted(els_cs_info_list, key=lambda els_cs_info: els_cs_info._energy_keV)
+        if len(els_cs_info_list) == 0:
+            raise ValueError("No ELSEPA record")
+
+        atomic_numbers = {els_cs_info._atomic_number for els_cs_info in els_cs_info_list}
+        if len(atomic_numbers) != 1:
+            raise ValueError("Records of different elements: {}".format(sorted(atomic_numbers)))
+        number_points = {els_cs_info._number_points for els_cs_info in els_cs_info_list}
+        if len(number_points) != 1:
+            raise ValueError("Records with different number of points: {}".format(sorted(number_points)))
+
+        energies_keV = np.array([els_cs_info._energy_keV for els_cs_info in els_cs_info_list])
+        total_cs_nm2 = np.array([els_cs_info._total_cs_nm2 for els_cs_info in els_cs_info_list])
+        ratios = np.stack([els_cs_info._ratios for els_cs_info in els_cs_info_list])
+
+        theta_rad = np.stack([els_cs_info._theta_rad for els_cs_info in els_cs_info_list])
+        if np.all(theta_rad == theta_rad[0]):
+            theta_rad = theta_rad[0].copy()
+
+        return cls(atomic_numbers.pop(), energies_keV, total_cs_nm2, ratios, theta_rad)
+
+    @classmethod
+    def from_arrays(cls, atomic_number, arrays):
+        """
+        Create a table from the arrays returned by :py:meth:`to_arrays`.
+        """
+        return cls(atomic_number, arrays["energies_keV"], arrays["total_cs_nm2"], arrays["ratios"], arrays["theta_rad"])
+
+    @classmethod
+    def load(cls, filepath):
+        """
+        Read a table written by :py:meth:`save`, the arrays are converted back to float64.
+        """
+        with np.load(filepath, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in cls.ARRAY_NAMES}
+            atomic_number = int(data["atomic_number"])
+        return cls.from_arrays(atomic_number, arrays)
+
+    def save(self, filepath, dtype=np.float32):
+        """
+        Write the table in a compact .npz companion file, by default with the angular data packed as float32.
+
+        The energies and the totals are kept in float64.
+        """
+        arrays = self.to_arrays()
+        arrays["ratios"] = self._ratios.astype(dtype)
+        arrays["theta_rad"] = self._theta_rad.astype(dtype)
+        with open(filepath, 'wb') as file:
+            np.savez(file, atomic_number=np.array(self._atomic_number), **arrays)
+
+    def to_arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    def __len__(self):
+        return len(self._energies_keV)
+
+    @property
+    def atomic_number(self):
+        return self._atomic_number
+
+    @property
+    def energies_keV(self):
+        return self._energies_keV
+
+    @property
+    def total_cs_nm2(self):
+        return self._total_cs_nm2
+
+    @property
+    def ratios(self):
+        return self._ratios
+
+    @property
+    def theta_rad(self):
+        return self._theta_rad
+
+    @property
+    def number_points(self):
+        return self._ratios.shape[1]
+
+    @property
+    def has_shared_angular_grid(self):
+        return self._theta_rad.ndim == 1
+
+    @property
+    def nbytes(self):
+        return self._energies_keV.nbytes + self._total_cs_nm2.nbytes + self._ratios.nbytes + self._theta_rad.nbytes
+
+    def get_theta_rad(self, index):
+        """
+        Return the angular grid of the row `index`.
+        """
+        if self.has_shared_angular_grid:
+            return self._theta_rad
+        else:
+            return self._theta_rad[index]
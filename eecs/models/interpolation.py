@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: eecs.models.interpolation
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Interpolation tools shared by the tabulated cross section models.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+
+# Globals and constants variables.
+
+
+def bracket_energies(table_energies, energies, log_energy=False, log_table_energies=None):
+    """
+    Find the rows of a table bracketing each energy and the interpolation weight of the upper row.
+
+    :param table_energies: sorted energies of the table rows
+    :param energies: energies inside the tabulated range
+    :param bool log_energy: compute the weights with log(energy)
+    :param log_table_energies: optional precomputed log of `table_energies` used when `log_energy` is True
+    :return: the lower rows and the weights, the upper rows are the lower rows + 1
+    """
+    table_energies = np.asarray(table_energies, dtype=np.float64)
+    energies = np.asarray(energies, dtype=np.float64)
+    if ((energies < table_energies[0]) | (energies > table_energies[-1])).any():
+        raise ValueError("A value in energies is outside the tabulated range [{}, {}]".format(
+            table_energies[0], table_energies[-1]))
+
+    rows = np.searchsorted(table_energies, energies, side='right') - 1
+    rows = np.minimum(np.maximum(rows, 0), len(table_energies) - 2)
+
+    if log_energy:
+        table_energies = np.log(table_energies) if log_table_energies is None else log_table_energies
+        energies = np.log(energies)
+
+    lower_energies = table_energies[rows]
+    weights = (energies - lower_energies) / (table_energies[rows + 1] - lower_energies)
+    return rows, weights
+
+
+def search_sorted_rows(grids, rows, values):
+    """
+    Find, like :py:func:`numpy.searchsorted` with `side='left'`, the insertion index of each value in its row.
+
+    The values are grouped by row with one sort and each group is searched in its row.
+
+    :param grids: 2D array with one sorted grid per row
+    :param rows: row of each value
+    :param values: values to search
+    :return: the number of grid values smaller than each value in its row
+    """
+    if np.shape(rows) != np.shape(values):
+        rows, values = np.broadcast_arrays(rows, values)
+    shape = np.shape(values)
+    rows = np.ravel(rows)
+    values = np.ravel(values)
+    if len(rows) == 0:
+        return np.zeros(shape, dtype=np.intp)
+    if rows[0] == rows[-1] and (rows == rows[0]).all():
+        return np.searchsorted(grids[rows[0]], values).reshape(shape)
+
+    order = np.argsort(rows, kind='stable')
+    sorted_rows = rows[order]
+    starts = np.flatnonzero(np.diff(sorted_rows)) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.concatenate((starts[1:], [len(rows)]))
+
+    indices = np.empty(len(rows), dtype=np.intp)
+    for start, end in zip(starts, ends):
+        group = order[start:end]
+        indices[group] = np.searchsorted(grids[sorted_rows[start]], values[group])
+
+    return indices.reshape(shape)
+
+
+def interpolate_rows(grids, table_values, rows, values):
+    """
+    Interpolate linearly each value in the selected row of a table.
+
+    The grid and the tabulated values are either shared by all rows (1D) or given for each row (2D). The results are
+    the same as :py:class:`scipy.interpolate.interp1d` with `kind='linear'` built on the row.
+
+    :param grids: sorted grid, 1D or 2D (rows x points)
+    :param table_values: tabulated values on the grid, 1D or 2D (rows x points)
+    :param rows: row of each value
+    :param values: values inside the grid range of their row
+    :return: the interpolated values
+    """
+    grids = np.asarray(grids, dtype=np.float64)
+    table_values = np.asarray(table_values, dtype=np.float64)
+    rows = np.asarray(rows, dtype=np.intp)
+    values = np.asarray(values, dtype=np.float64)
+    if rows.ndim == 0:
+        grids = grids if grids.ndim == 1 else grids[rows]
+        table_values = table_values if table_values.ndim == 1 else table_values[rows]
+    elif rows.shape != values.shape:
+        rows, values = np.broadcast_arrays(rows, values)
+
+    if grids.ndim == 1:
+        minimum_values, maximum_values = grids[0], grids[-1]
+        upper_indices = np.searchsorted(grids, values)
+    else:
+        minimum_values, maximum_values = grids[rows, 0], grids[rows, -1]
+        upper_indices = search_sorted_rows(grids, rows, values)
+    if ((values < minimum_values) | (values > maximum_values)).any():
+        raise ValueError("A value is outside the interpolation range of its row")
+
+    upper_indices = np.minimum(np.maximum(upper_indices, 1), grids.shape[-1] - 1)
+    lower_indices = upper_indices - 1
+
+    lower_grids = _take_rows(grids, rows, lower_indices)
+    upper_grids = _take_rows(grids, rows, upper_indices)
+    lower_values = _take_rows(table_values, rows, lower_indices)
+    upper_values = _take_rows(table_values, rows, upper_indices)
+
+    slopes = (upper_values - lower_values) / (upper_grids - lower_grids)
+    return slopes * (values - lower_grids) + lower_values
+
+
+def _take_rows(array, rows, indices):
+    if array.ndim == 1:
+        return array[indices]
+    return array[rows, indices]
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: eecs.models.material
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Elastic cross sections of a material, compound or pure element, from the ELSEPA cross sections of its elements.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+from eecs.element_properties import compute_atomic_density_atom_cm3, get_atomic_mass_g_mol
+from eecs.models.interpolation import bracket_energies, interpolate_rows
+
+# Globals and constants variables.
+NM3_TO_CM3 = 1.0e-21
+
+
+class Material:
+    """
+    Elastic cross sections of a material tabulated on a shared energy grid.
+
+    The atomic density of each element is computed from the mass density and the weight fractions. On the energy grid,
+    the material precomputes the inverse mean free path, i.e. the sum of the atomic density times the total cross
+    section of the elements, and the cumulative probabilities to select each element in an elastic event. A Monte Carlo
+    step then needs one interpolation of the inverse mean free path and one vectorized element choice.
+
+    The inverse mean free path is interpolated in log-log and the cumulative probabilities in log(energy).
+
+    :param elsepa_casino: :py:class:`eecs.models.elsepa_casino.ElsepaCasino` with the cross sections of the elements
+    :param dict weight_fractions: weight fraction of each atomic number, normalized to 1
+    :param float mass_density_g_cm3: mass density of the material
+    :param energies_eV: energy grid, by default the tabulated energies of the elements in their common range
+    """
+    def __init__(self, elsepa_casino, weight_fractions, mass_density_g_cm3, energies_eV=None):
+        self.atomic_numbers = np.array(sorted(weight_fractions), dtype=int)
+        weight_fractions = np.array([weight_fractions[atomic_number] for atomic_number in self.atomic_numbers],
+                                    dtype=np.float64)
+        if len(weight_fractions) == 0 or np.any(weight_fractions <= 0.0):
+            raise ValueError("The material needs elements with positive weight fractions")
+        self.weight_fractions = weight_fractions / np.sum(weight_fractions)
+        self.mass_density_g_cm3 = mass_density_g_cm3
+
+        self.atomic_densities_atom_nm3 = np.array(
+            [compute_atomic_density_atom_cm3(mass_density_g_cm3 * weight_fraction,
+                                             get_atomic_mass_g_mol(atomic_number)) * NM3_TO_CM3
+             for atomic_number, weight_fraction in zip(self.atomic_numbers, self.weight_fractions)])
+
+        if energies_eV is None:
+            energies_eV = self._get_common_energies_eV(elsepa_casino)
+        self.energies_eV = np.asarray(energies_eV, dtype=np.float64)
+
+        totals_nm2 = np.stack([elsepa_casino.total_nm2(atomic_number, self.energies_eV)
+                               for atomic_number in self.atomic_numbers], axis=-1)
+        partial_inverse_mean_free_paths_1_nm = totals_nm2 * self.atomic_densities_atom_nm3
+
+        self.inverse_mean_free_paths_1_nm = np.sum(partial_inverse_mean_free_paths_1_nm, axis=-1)
+        self.cumulative_probabilities = (np.cumsum(partial_inverse_mean_free_paths_1_nm, axis=-1) /
+                                         self.inverse_mean_free_paths_1_nm[:, np.newaxis])
+
+        self._log_energies = np.log(self.energies_eV)
+        self._log_inverse_mean_free_paths = np.log(self.inverse_mean_free_paths_1_nm)
+
+    @classmethod
+    def from_atom_fractions(cls, elsepa_casino, atom_fractions, mass_density_g_cm3, energies_eV=None):
+        """
+        Create the material from the number of atoms of each element in the formula, e.g. {14: 1, 8: 2} for SiO2.
+        """
+        weight_fractions = {atomic_number: atom_fraction * get_atomic_mass_g_mol(atomic_number)
+                            for atomic_number, atom_fraction in atom_fractions.items()}
+        return cls(elsepa_casino, weight_fractions, mass_density_g_cm3, energies_eV)
+
+    def _get_common_energies_eV(self, elsepa_casino):
+        energies_list = [elsepa_casino.total_element(atomic_number).energies_eV
+                         for atomic_number in self.atomic_numbers]
+        minimum_energy_eV = max(energies[0] for energies in energies_list)
+        maximum_energy_eV = min(energies[-1] for energies in energies_list)
+        if not minimum_energy_eV < maximum_energy_eV:
+            raise ValueError("The elements do not have a common energy range")
+
+        energies_eV = np.unique(np.concatenate(energies_list))
+        return energies_eV[(energies_eV >= minimum_energy_eV) & (energies_eV <= maximum_energy_eV)]
+
+    @property
+    def number_elements(self):
+        return len(self.atomic_numbers)
+
+    def inverse_mean_free_path_1_nm(self, energy_eV):
+        """
+        Inverse elastic mean free path in 1/nm at the energies, scalar or array, inside the energy grid.
+        """
+        log_inverse_mean_free_paths = interpolate_rows(self._log_energies, self._log_inverse_mean_free_paths, 0,
+                                                       np.log(energy_eV))
+        return np.exp(log_inverse_mean_free_paths)
+
+    def mean_free_path_nm(self, energy_eV):
+        """
+        Elastic mean free path in nm at the energies, scalar or array, inside the energy grid.
+        """
+        return 1.0 / self.inverse_mean_free_path_1_nm(energy_eV)
+
+    def choose_element(self, energies_eV, random_numbers=None, rng=None):
+        """
+        Choose the atomic number of the target atom of an elastic event for each energy.
+
+        :param energies_eV: energies of the electrons in eV
+        :param random_numbers: uniform random numbers in [0, 1), drawn from `rng` when not given
+        :param rng: :py:class:`numpy.random.Generator` used when `random_numbers` is not given
+        :return: the atomic numbers with the shape of `energies_eV`
+        """
+        energies_eV = np.asarray(energies_eV, dtype=np.float64)
+        if random_numbers is None:
+            if rng is None:
+                rng = np.random.default_rng()
+            random_numbers = rng.random(energies_eV.shape)
+        random_numbers = np.asarray(random_numbers, dtype=np.float64)
+        if energies_eV.shape != random_numbers.shape:
+            energies_eV, random_numbers = np.broadcast_arrays(energies_eV, random_numbers)
+
+        rows, weights = bracket_energies(self.energies_eV, energies_eV, log_energy=True)
+        lower_probabilities = self.cumulative_probabilities[rows, :-1]
+        upper_probabilities = self.cumulative_probabilities[rows + 1, :-1]
+        probabilities = lower_probabilities + weights[..., np.newaxis] * (upper_probabilities - lower_probabilities)
+
+        element_indices = (probabilities <= random_numbers[..., np.newaxis]).sum(axis=-1)
+        return self.atomic_numbers[element_indices]
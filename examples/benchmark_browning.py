@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: benchmark_browning
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Benchmark the vectorized Browning models.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+
+# Standard library modules.
+import os
+import math
+import timeit
+import tracemalloc
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+from eecs.models.browning import total_elastic_cross_section_browning1991a_cm2, \
+    total_elastic_cross_section_browning1994_cm2, ratio_browning1994, sample_polar_angles_rad, \
+    compute_mean_theta_total_browning, accumulate_polar_angle_histogram, accumulate_polar_angle_histogram_parallel
+
+# Globals and constants variables.
+NUMBER_REPEATS = 5
+
+
+def total_elastic_cross_section_browning1991a_cm2_math(atomic_number, energy_keV):
+    """
+    Scalar version with the :py:mod:`math` functions, as before the vectorization, kept for the benchmark.
+    """
+    Z = atomic_number
+    E = energy_keV
+    nominator = math.pow(Z, 1.33) + 0.032*Z*Z
+    denominator = E + 0.0155 * math.pow(Z, 1.33) * math.pow(E, 0.5)
+    u = math.log10(8.0) * E * math.pow(Z, -1.33)
+    return 4.7e-18 * nominator / denominator / (1.0 - 0.02 * math.pow(Z, 0.5) * math.exp(-u*u))
+
+
+def total_elastic_cross_section_browning1994_cm2_math(atomic_number, energy_keV):
+    """
+    Scalar version with the :py:mod:`math` functions, as before the vectorization, kept for the benchmark.
+    """
+    Z = atomic_number
+    E = energy_keV
+    power_z = math.pow(Z, 1.7)
+    power_e = math.pow(E, 0.5)
+    return 3.0e-18 * power_z / (E + 0.005 * power_z * power_e + 0.0007 * Z * Z / power_e)
+
+
+def ratio_browning1994_math(atomic_number, energy_keV):
+    """
+    Scalar version with the :py:mod:`math` functions, as before the vectorization, kept for the benchmark.
+    """
+    Z = atomic_number
+    E = energy_keV
+    return 300.0 * math.pow(E, 1.0 - Z/2000.0) / Z + math.pow(Z, 3.0) / (3.0e5 * E)
+
+
+def polar_angle_rad_math(atomic_number, energy_keV, random_number1, random_number2):
+    """
+    Scalar version with the :py:mod:`math` functions, as before the vectorization, kept for the benchmark.
+    """
+    ratio = ratio_browning1994_math(atomic_number, energy_keV)
+    if random_number2 <= ratio / (1.0 + ratio):
+        alpha = 7.0e-3 / energy_keV
+        cos_theta = 1.0 - 2.0 * alpha * random_number1 / (1.0 + alpha - random_number1)
+    else:
+        cos_theta = 1.0 - 2.0 * random_number1
+
+    return math.acos(min(max(cos_theta, -1.0), 1.0))
+
+
+def sample_polar_angles_list_comprehension(atomic_number, energy_keV, number_samples):
+    return [polar_angle_rad_math(atomic_number, energy_keV, np.random.random(), np.random.random())
+            for _i in range(number_samples)]
+
+
+def compute_table_list_comprehension(function, atomic_numbers, energies_keV):
+    return np.array([[function(atomic_number, energy_keV) for energy_keV in energies_keV]
+                     for atomic_number in atomic_numbers])
+
+
+def compute_table_broadcast(function, atomic_numbers, energies_keV):
+    return function(np.asarray(atomic_numbers)[:, np.newaxis], energies_keV)
+
+
+def benchmark_tables():
+    atomic_numbers = list(range(1, 93))
+    energies_keV = np.linspace(0.1, 100.0, 1000)
+    number_values = len(atomic_numbers) * len(energies_keV)
+
+    for scalar_function, function in [
+            (total_elastic_cross_section_browning1991a_cm2_math, total_elastic_cross_section_browning1991a_cm2),
+            (total_elastic_cross_section_browning1994_cm2_math, total_elastic_cross_section_browning1994_cm2),
+            (ratio_browning1994_math, ratio_browning1994)]:
+        table_ref = compute_table_list_comprehension(scalar_function, atomic_numbers, energies_keV.tolist())
+        table = compute_table_broadcast(function, atomic_numbers, energies_keV)
+        assert np.allclose(table_ref, table, rtol=1.0e-14, atol=0.0)
+
+        reference_time_s = min(timeit.repeat(
+            lambda: compute_table_list_comprehension(scalar_function, atomic_numbers, energies_keV.tolist()),
+            number=1, repeat=NUMBER_REPEATS))
+        time_s = min(timeit.repeat(lambda: compute_table_broadcast(function, atomic_numbers, energies_keV),
+                                   number=1, repeat=NUMBER_REPEATS))
+
+        print(function.__name__)
+        print("{:30s} {:10.3e} values/s".format("Scalar math list comprehension", number_values / reference_time_s))
+        print("{:30s} {:10.3e} values/s".format("NumPy broadcast Z x E", number_values / time_s))
+        print("Speedup: {:.1f}x".format(reference_time_s / time_s))
+
+
+def benchmark_polar_angle_sampler():
+    atomic_number = 79
+    energy_keV = 1.0
+    number_samples = 1000000
+    rng = np.random.default_rng(2021)
+
+    reference_time_s = min(timeit.repeat(
+        lambda: sample_polar_angles_list_comprehension(atomic_number, energy_keV, number_samples),
+        number=1, repeat=NUMBER_REPEATS))
+    time_s = min(timeit.repeat(lambda: sample_polar_angles_rad(atomic_number, energy_keV, number_samples, rng),
+                               number=1, repeat=NUMBER_REPEATS))
+
+    print("Polar angle sampling, {:d} samples".format(number_samples))
+    print("{:30s} {:10.3f} s".format("Scalar math list comprehension", reference_time_s))
+    print("{:30s} {:10.3f} s".format("sample_polar_angles_rad", time_s))
+    print("Speedup: {:.1f}x".format(reference_time_s / time_s))
+
+
+def compute_mean_theta_total_monte_carlo(atomic_number, energies_eV, rng):
+    return [compute_mean_theta_total_browning(atomic_number, energy_eV, method="monte_carlo", rng=rng)
+            for energy_eV in energies_eV]
+
+
+def benchmark_mean_theta_total():
+    atomic_number = 79
+    rng = np.random.default_rng(2021)
+
+    energies_eV = np.linspace(1.0e3, 1.0e5, 10)
+    reference_time_s = min(timeit.repeat(lambda: compute_mean_theta_total_monte_carlo(atomic_number, energies_eV, rng),
+                                         number=1, repeat=NUMBER_REPEATS)) / len(energies_eV)
+
+    energies_eV = np.linspace(1.0e3, 1.0e5, 100000)
+    time_s = min(timeit.repeat(lambda: compute_mean_theta_total_browning(atomic_number, energies_eV),
+                               number=1, repeat=NUMBER_REPEATS)) / len(energies_eV)
+
+    print("Mean theta and total")
+    print("{:30s} {:10.3e} s/energy".format("Monte Carlo, 10^6 samples", reference_time_s))
+    print("{:30s} {:10.3e} s/energy".format("Analytic", time_s))
+    print("Speedup: {:.1f}x".format(reference_time_s / time_s))
+
+
+def histogram_all_samples(atomic_number, energy_keV, number_samples, rng):
+    polar_angles_rad = sample_polar_angles_rad(atomic_number, energy_keV, number_samples, rng)
+    return np.histogram(polar_angles_rad, bins=100, range=(0.0, np.pi), density=True)
+
+
+def benchmark_streaming_histogram():
+    atomic_number = 79
+    energy_keV = 1.0
+    rng = np.random.default_rng(2021)
+
+    print("Polar angle histogram")
+    for number_samples in [1000000, 10000000]:
+        for name, function in [("All samples", histogram_all_samples),
+                               ("Streaming chunks", accumulate_polar_angle_histogram)]:
+            tracemalloc.start()
+            start_time_s = timeit.default_timer()
+            function(atomic_number, energy_keV, number_samples, rng=rng)
+            time_s = timeit.default_timer() - start_time_s
+            _current_size, peak_size = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print("{:8d} samples {:20s} {:8.3f} s {:10.1f} MB peak".format(number_samples, name, time_s,
+                                                                           peak_size / 1024.0 / 1024.0))
+
+
+def benchmark_parallel_histogram():
+    atomic_number = 79
+    energy_keV = 1.0
+    number_samples = 100000000
+    seed = 2021
+
+    print("Parallel polar angle histogram, {:d} samples, {} cores".format(number_samples, os.cpu_count()))
+    reference_time_s = None
+    for number_workers in [1, 2, 4, 8]:
+        start_time_s = timeit.default_timer()
+        histogram = accumulate_polar_angle_histogram_parallel(atomic_number, energy_keV, number_samples, seed=seed,
+                                                              number_workers=number_workers)
+        time_s = timeit.default_timer() - start_time_s
+        if reference_time_s is None:
+            reference_time_s = time_s
+        print("{:2d} workers {:8.3f} s mean {:.6f} rad speedup {:.1f}x".format(number_workers, time_s, histogram.mean,
+                                                                               reference_time_s / time_s))
+
+
+def run():
+    benchmark_tables()
+    benchmark_polar_angle_sampler()
+    benchmark_mean_theta_total()
+    benchmark_streaming_histogram()
+    benchmark_parallel_histogram()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    run()
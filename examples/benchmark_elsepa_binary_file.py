@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: benchmark_elsepa_binary_file
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Benchmark the readers of ELSEPA binary files.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import os.path
+import timeit
+
+# Third party modules.
+
+# Local modules.
+from casinotools.file_format.file_reader_writer_tools import read_int, read_double
+
+# Project modules.
+from eecs import get_current_module_path
+from eecs.models.elsepa_binary_file import ElsepaBinaryFile, read_energies_totals
+
+# Globals and constants variables.
+NUMBER_REPEATS = 5
+
+
+def read_file_point_by_point(filepath):
+    """
+    Reference reader decoding each angular point with two calls to `read_double`.
+    """
+    file_size = os.path.getsize(filepath)
+    records = []
+    with open(filepath, 'rb') as file:
+        while file.tell() < file_size:
+            read_int(file)
+            read_double(file)
+            read_double(file)
+            read_double(file)
+            number_points = read_int(file)
+            ratios = []
+            thetas_rad = []
+            for dummy in range(number_points):
+                ratios.append(read_double(file))
+                thetas_rad.append(read_double(file))
+            records.append((ratios, thetas_rad))
+
+    return records
+
+
+def read_file_bulk(filepath):
+    return ElsepaBinaryFile(filepath)
+
+
+def read_file_header_only(filepath):
+    return read_energies_totals(filepath)
+
+
+def benchmark(name, function, filepath):
+    times_s = timeit.repeat(lambda: function(filepath), number=1, repeat=NUMBER_REPEATS)
+    time_s = min(times_s)
+    print("{:30s} {:10.3f} ms".format(name, time_s * 1.0e3))
+    return time_s
+
+
+def run():
+    filepath = get_current_module_path(__file__, "../test_data/casino3/EL29.els")
+
+    reference_time_s = benchmark("Point by point", read_file_point_by_point, filepath)
+    time_s = benchmark("Bulk NumPy decoding", read_file_bulk, filepath)
+    print("Speedup: {:.1f}x".format(reference_time_s / time_s))
+
+    header_time_s = benchmark("Header-only scan", read_file_header_only, filepath)
+    print("Speedup over bulk decoding: {:.1f}x".format(time_s / header_time_s))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    run()
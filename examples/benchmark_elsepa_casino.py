@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: benchmark_elsepa_casino
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Benchmark the ELSEPA CASINO tables.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+
+# Standard library modules.
+import io
+import timeit
+import tracemalloc
+from zipfile import ZipFile
+
+# Third party modules.
+import numpy as np
+from scipy.interpolate import interp1d
+
+# Local modules.
+
+# Project modules.
+from eecs import get_current_module_path
+from eecs.models.elsepa_casino import read_table, ElsepaCasino, TotalElement, AngleElement, PartialElement, \
+    get_member_name
+from eecs.models.interpolation import bracket_energies
+from eecs.models.material import Material
+
+# Globals and constants variables.
+NUMBER_REPEATS = 5
+ZIP_FILENAME = "ELSEPA_AbsorptionCorrection_LinearInterpolationTabulation_0.1.zip"
+
+
+def read_table_list_of_lists(data):
+    """
+    Reference parser building a list of lists with a `float()` call for each item.
+    """
+    lines = data.decode('ascii').splitlines()
+
+    header_items = lines[0].split('\t')
+    values = []
+    for line in lines[1:]:
+        items = line.strip().split('\t')
+        try:
+            values.append([float(item) for item in items])
+        except ValueError:
+            pass
+
+    return header_items, values
+
+
+def benchmark(name, function, *args):
+    times_s = timeit.repeat(lambda: function(*args), number=1, repeat=NUMBER_REPEATS)
+    time_s = min(times_s)
+
+    tracemalloc.start()
+    function(*args)
+    _current_size, peak_size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print("{:30s} {:10.3f} ms {:10.1f} MB peak".format(name, time_s * 1.0e3, peak_size / 1024.0 / 1024.0))
+    return time_s
+
+
+def benchmark_read_table():
+    for filename in ["A_C.txt", "P_C.txt", "T_C.txt"]:
+        filepath = get_current_module_path(__file__, "../test_data/" + filename)
+        with open(filepath, 'rb') as file:
+            data = file.read()
+
+        print(filename)
+        reference_time_s = benchmark("List of lists", read_table_list_of_lists, data)
+        time_s = benchmark("NumPy read_table", read_table, data)
+        print("Speedup: {:.1f}x".format(reference_time_s / time_s))
+
+
+def sample_angle_deg_one_by_one(elsepa_casino, atomic_number, energies_eV, random_numbers):
+    return [elsepa_casino.angle_deg(atomic_number, energy_eV, random_number)
+            for energy_eV, random_number in zip(energies_eV, random_numbers)]
+
+
+def benchmark_angle_sampler():
+    atomic_number = 6
+    zip_filepath = get_current_module_path(__file__, "../test_data/" + ZIP_FILENAME)
+    elsepa_casino = ElsepaCasino(zip_filepath)
+    sampler = elsepa_casino.angle_sampler(atomic_number)
+
+    rng = np.random.default_rng(2021)
+    number_samples = 10000
+    energies_eV = rng.uniform(1.0e3, 3.0e4, number_samples)
+    random_numbers = rng.random(number_samples)
+    print("Angle sampling")
+    time_s = benchmark("angle_deg one by one", sample_angle_deg_one_by_one, elsepa_casino, atomic_number,
+                       energies_eV, random_numbers)
+    reference_rate = number_samples / time_s
+    print("{:30s} {:10.3e} samples/s".format("", reference_rate))
+
+    number_samples = 1000000
+    energies_eV = rng.uniform(1.0e3, 3.0e4, number_samples)
+    time_s = benchmark("AngleSampler", sampler.sample, energies_eV, rng)
+    rate = number_samples / time_s
+    print("{:30s} {:10.3e} samples/s".format("", rate))
+    print("Speedup: {:.1f}x".format(rate / reference_rate))
+
+    alias_sampler = elsepa_casino.alias_angle_sampler(atomic_number)
+    time_s = benchmark("AliasAngleSampler", alias_sampler.sample, energies_eV, rng)
+    rate = number_samples / time_s
+    print("{:30s} {:10.3e} samples/s".format("", rate))
+    print("Speedup: {:.1f}x".format(rate / reference_rate))
+
+
+class Interp1dAngleElement(AngleElement):
+    """
+    Angle element with one :py:class:`scipy.interpolate.interp1d` per energy row, as before the interpolation
+    kernel, kept for the benchmark.
+    """
+    def __init__(self, energies_eV, random_numbers, angles_deg, log_energy=False):
+        super().__init__(energies_eV, random_numbers, angles_deg, log_energy)
+        self.angle_functions = [interp1d(random_numbers_row, self.angles_deg, kind='linear')
+                                for random_numbers_row in self.random_numbers]
+
+    def __call__(self, energy_eV, random_number):
+        energies_eV, random_numbers = np.broadcast_arrays(np.asarray(energy_eV, dtype=np.float64),
+                                                          np.asarray(random_number, dtype=np.float64))
+        rows, weights = bracket_energies(self.energies_eV, energies_eV, self.log_energy)
+
+        lower_angles_deg = evaluate_rows(self.angle_functions, rows, random_numbers)
+        upper_angles_deg = evaluate_rows(self.angle_functions, rows + 1, random_numbers)
+        return lower_angles_deg + weights * (upper_angles_deg - lower_angles_deg)
+
+
+class Interp1dPartialElement(PartialElement):
+    """
+    Partial element with one :py:class:`scipy.interpolate.interp1d` per energy row, as before the interpolation
+    kernel, kept for the benchmark.
+    """
+    def __init__(self, energies_eV, angles_deg, partials_nm2_sr_2D, log_energy=False):
+        super().__init__(energies_eV, angles_deg, partials_nm2_sr_2D, log_energy)
+        self.partial_functions = [interp1d(self.angles_deg, partials_nm2_sr_row, kind='linear')
+                                  for partials_nm2_sr_row in self.partials_nm2_sr]
+
+    def __call__(self, energy_eV, angle_deg):
+        energies_eV, angles_deg = np.broadcast_arrays(np.asarray(energy_eV, dtype=np.float64),
+                                                      np.asarray(angle_deg, dtype=np.float64))
+        rows, weights = bracket_energies(self.energies_eV, energies_eV, self.log_energy)
+
+        lower_partials_nm2_sr = evaluate_rows(self.partial_functions, rows, angles_deg)
+        upper_partials_nm2_sr = evaluate_rows(self.partial_functions, rows + 1, angles_deg)
+        return lower_partials_nm2_sr + weights * (upper_partials_nm2_sr - lower_partials_nm2_sr)
+
+
+def evaluate_rows(functions, rows, values):
+    results = np.empty(np.shape(values))
+    for row in np.unique(rows):
+        mask = rows == row
+        results[mask] = functions[row](values[mask])
+    return results
+
+
+def call_repeatedly(function, number_calls, *args):
+    for _call_id in range(number_calls):
+        function(*args)
+
+
+def benchmark_interpolation_kernel():
+    rng = np.random.default_rng(2021)
+    number_values = 10000
+    energies_eV = rng.uniform(1.0e3, 3.0e4, number_values)
+
+    for prefix, element_classes, maximum_value in [("A_C.txt", (Interp1dAngleElement, AngleElement), 1.0),
+                                                   ("P_C.txt", (Interp1dPartialElement, PartialElement), 180.0)]:
+        filepath = get_current_module_path(__file__, "../test_data/" + prefix)
+        with open(filepath, 'rb') as file:
+            header_items, values = read_table(file.read())
+        table_arguments = [values[:, 0], values[:, 1:], np.array(header_items[1:], dtype=np.float64)]
+        if prefix.startswith("P_"):
+            table_arguments = [table_arguments[0], table_arguments[2], table_arguments[1]]
+        values = rng.random(number_values) * maximum_value
+
+        print(prefix)
+        times_s = []
+        for element_class in element_classes:
+            element = element_class(*table_arguments)
+            print(element_class.__name__)
+            load_time_s = benchmark("Load", element_class, *table_arguments)
+            scalar_time_s = benchmark("Call, 1 value x 1000", call_repeatedly, element, 1000, energies_eV[0],
+                                      values[0])
+            vector_time_s = benchmark("Call, {:d} values".format(number_values), element, energies_eV, values)
+            times_s.append((load_time_s, scalar_time_s, vector_time_s))
+
+        for label, reference_time_s, time_s in zip(["Load", "Call, 1 value x 1000", "Call, vector"], *times_s):
+            print("Speedup {:20s} {:.1f}x".format(label, reference_time_s / time_s))
+
+
+def benchmark_total_log_log():
+    filepath = get_current_module_path(__file__, "../test_data/T_C.txt")
+    with open(filepath, 'rb') as file:
+        _header_items, values = read_table(file.read())
+    energies_eV = values[:, 0]
+    totals_nm2 = values[:, 1]
+
+    print("Total cross section on a coarser energy grid, maximum relative error")
+    for step in [2, 4, 8, 16]:
+        mask = energies_eV <= energies_eV[::step][-1]
+        errors = []
+        for log_log in [False, True]:
+            total_element = TotalElement(energies_eV[::step], totals_nm2[::step], log_log)
+            errors.append(np.max(np.abs(total_element(energies_eV[mask]) / totals_nm2[mask] - 1.0)))
+        print("Every {:2d} energies: linear {:8.3%} log-log {:8.3%}".format(step, *errors))
+
+    rng = np.random.default_rng(2021)
+    total_element = TotalElement(energies_eV, totals_nm2, log_log=True)
+    energies_eV = rng.uniform(1.0e3, 3.0e4, 1000000)
+    benchmark("Log-log total, 10^6 values", total_element, energies_eV)
+
+
+def step_element_by_element(elsepa_casino, atomic_densities_atom_nm3, energies_eV, random_numbers):
+    for energy_eV, random_number in zip(energies_eV, random_numbers):
+        partial_inverse_mean_free_paths_1_nm = [atomic_density_atom_nm3 * elsepa_casino.total_nm2(atomic_number,
+                                                                                                  energy_eV)
+                                                for atomic_number, atomic_density_atom_nm3
+                                                in atomic_densities_atom_nm3.items()]
+        inverse_mean_free_path_1_nm = sum(partial_inverse_mean_free_paths_1_nm)
+        cumulative_probability = 0.0
+        for atomic_number, partial_inverse_mean_free_path_1_nm in zip(atomic_densities_atom_nm3,
+                                                                      partial_inverse_mean_free_paths_1_nm):
+            cumulative_probability += partial_inverse_mean_free_path_1_nm / inverse_mean_free_path_1_nm
+            if random_number < cumulative_probability:
+                break
+
+
+def step_material(material, energies_eV, random_numbers):
+    for energy_eV, random_number in zip(energies_eV, random_numbers):
+        material.inverse_mean_free_path_1_nm(energy_eV)
+        material.choose_element(energy_eV, random_number)
+
+
+def step_material_vectorized(material, energies_eV, random_numbers):
+    material.inverse_mean_free_path_1_nm(energies_eV)
+    material.choose_element(energies_eV, random_numbers)
+
+
+def benchmark_material():
+    # Only the carbon tables are in the test data, they are used for all the elements of the materials.
+    zip_filepath = get_current_module_path(__file__, "../test_data/" + ZIP_FILENAME)
+    zip_data = io.BytesIO()
+    with ZipFile(zip_filepath) as input_file, ZipFile(zip_data, mode='w') as output_file:
+        for atomic_number in [8, 14, 24, 25, 26, 28]:
+            for prefix in ["T_", "A_", "P_"]:
+                output_file.writestr(get_member_name(prefix, atomic_number),
+                                     input_file.read(get_member_name(prefix, 6)))
+    elsepa_casino = ElsepaCasino(zip_data)
+
+    materials = {"SiO2": Material.from_atom_fractions(elsepa_casino, {14: 1, 8: 2}, 2.65),
+                 "Steel": Material(elsepa_casino, {26: 0.70, 24: 0.18, 28: 0.10, 25: 0.02}, 7.9)}
+
+    rng = np.random.default_rng(2021)
+    number_steps = 10000
+    energies_eV = rng.uniform(1.0e3, 3.0e4, number_steps)
+    random_numbers = rng.random(number_steps)
+
+    for name, material in materials.items():
+        atomic_densities_atom_nm3 = dict(zip(material.atomic_numbers.tolist(), material.atomic_densities_atom_nm3))
+
+        print("{} steps, {:d} steps".format(name, number_steps))
+        reference_time_s = benchmark("Element by element", step_element_by_element, elsepa_casino,
+                                     atomic_densities_atom_nm3, energies_eV, random_numbers)
+        time_s = benchmark("Material", step_material, material, energies_eV, random_numbers)
+        print("Speedup: {:.1f}x".format(reference_time_s / time_s))
+        time_s = benchmark("Material vectorized", step_material_vectorized, material, energies_eV, random_numbers)
+        print("Speedup: {:.1f}x".format(reference_time_s / time_s))
+
+
+def run():
+    benchmark_read_table()
+    benchmark_angle_sampler()
+    benchmark_interpolation_kernel()
+    benchmark_total_log_log()
+    benchmark_material()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    run()
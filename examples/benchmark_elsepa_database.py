@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: benchmark_elsepa_database
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Benchmark the parallel loading of an ELSEPA element database directory.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+
+# Standard library modules.
+import os
+import os.path
+import sys
+import tempfile
+import time
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules.
+from eecs.models.elsepa_database import load_tables
+
+# Globals and constants variables.
+
+
+def run(path):
+    atomic_numbers = range(1, 99+1)
+
+    maximum_number_workers = os.cpu_count() or 1
+    number_workers = 1
+    while number_workers <= maximum_number_workers:
+        start_time_s = time.perf_counter()
+        tables, times_s = load_tables(path, atomic_numbers, number_workers=number_workers)
+        total_time_s = time.perf_counter() - start_time_s
+
+        print("{:3d} workers: {:8.3f} s for {:d} files (sum of file times {:.3f} s)".format(
+            number_workers, total_time_s, len(tables), sum(times_s.values())))
+        number_workers *= 2
+
+    with tempfile.TemporaryDirectory() as cache_path:
+        cache_filepath = os.path.join(cache_path, "elsepa_cache.npz")
+        for label in ["Cold cache", "Warm cache"]:
+            start_time_s = time.perf_counter()
+            tables, times_s = load_tables(path, atomic_numbers, cache_filepath=cache_filepath)
+            total_time_s = time.perf_counter() - start_time_s
+            print("{}: {:8.3f} s for {:d} files ({:d} parsed)".format(label, total_time_s, len(tables), len(times_s)))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    run(sys.argv[1] if len(sys.argv) > 1 else r"D:\work\data\Casino3\ELDB")
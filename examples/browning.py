@@ -39,7 +39,7 @@ from eecs.numeric_conversion import cm2_to_nm2
 from eecs.models.browning import total_elastic_cross_section_rutherford_cm2, average_scattering_angle_rutherford_deg, \
     total_elastic_cross_section_browning1991a_cm2, average_scattering_angle_rutherford_decreased_screening_deg, \
     differential_cross_section_browning1991_cm2_sr, ratio_browning1994, ratio_browning1994_mcx_ray, \
-    compute_polar_angle_one_random_number_rad, compute_polar_angle_two_random_numbers_rad
+    accumulate_polar_angle_histogram
 
 # Globals and constants variables.
 
@@ -55,11 +55,11 @@ def plot_figure2_browning1991a():
     for element in elements:
         Z = atomic_numbers[element]
         color = colors.next()
-        cross_sections_cm2 = [total_elastic_cross_section_rutherford_cm2(Z, E_keV) for E_keV in energies_keV]
-        cross_sections_pm2 = np.array(cross_sections_cm2)*1.0e16
+        cross_sections_cm2 = total_elastic_cross_section_rutherford_cm2(Z, energies_keV)
+        cross_sections_pm2 = cross_sections_cm2*1.0e16
         plt.loglog(energies_keV, cross_sections_pm2, '--', color=color)
-        cross_sections_cm2 = [total_elastic_cross_section_browning1991a_cm2(Z, E_keV) for E_keV in energies_keV]
-        cross_sections_pm2 = np.array(cross_sections_cm2)*1.0e16
+        cross_sections_cm2 = total_elastic_cross_section_browning1991a_cm2(Z, energies_keV)
+        cross_sections_pm2 = cross_sections_cm2*1.0e16
         plt.loglog(energies_keV, cross_sections_pm2, color=color, label=element)
 
     plt.xlabel("Electron Energy (keV)")
@@ -80,12 +80,11 @@ def plot_figure3_browning1991():
     for element in elements:
         Z = atomic_numbers[element]
         color = colors.next()
-        average_angles_deg = [average_scattering_angle_rutherford_deg(Z, E_keV) for E_keV in energies_keV]
+        average_angles_deg = average_scattering_angle_rutherford_deg(Z, energies_keV)
         plt.plot(energies_keV, average_angles_deg, color=color, label=element)
 
         color = colors.next()
-        average_angles_deg = [average_scattering_angle_rutherford_decreased_screening_deg(Z, E_keV)
-                              for E_keV in energies_keV]
+        average_angles_deg = average_scattering_angle_rutherford_decreased_screening_deg(Z, energies_keV)
         plt.plot(energies_keV, average_angles_deg, color=color)
 
     plt.xlabel("Energy (keV)")
@@ -108,8 +107,7 @@ def plot_figure4_browning1991():
     for element in elements:
         Z = atomic_numbers[element]
         color = colors.next()
-        differential_cross_sections = [differential_cross_section_browning1991_cm2_sr(Z, energy_keV, angle_rad)
-                                       for angle_rad in angles_rad]
+        differential_cross_sections = differential_cross_section_browning1991_cm2_sr(Z, energy_keV, angles_rad)
         plt.plot(angles_deg, differential_cross_sections, color=color, label=element)
 
     plt.xlabel("Angle (Degrees)")
@@ -130,13 +128,13 @@ def plot_comparison_ratio_mcxray_error():
     for element in elements:
         Z = atomic_numbers[element]
         color = colors.next()
-        ratios = np.array([ratio_browning1994(Z, E_keV) for E_keV in energies_keV])
+        ratios = ratio_browning1994(Z, energies_keV)
         ratios = ratios / (1.0 + ratios)
         label = "{} Browning".format(element)
         plt.semilogx(energies_keV, ratios, color=color, label=label)
 
         color = colors.next()
-        ratios = np.array([ratio_browning1994_mcx_ray(Z, E_keV) for E_keV in energies_keV])
+        ratios = ratio_browning1994_mcx_ray(Z, energies_keV)
         ratios = ratios / (1.0 + ratios)
         label = "{} MCXRay".format(element)
         plt.semilogx(energies_keV, ratios, color=color, label=label)
@@ -157,16 +155,16 @@ def plot_comparison_polar_angle_random_number():
     print("Ratio = {:.4f}".format(ratio))
     print("Ratio/(1 + Ratio) = %.4f" % (ratio/(1.0 + ratio)))
 
-    polar_angles_one_random_number_rad = [compute_polar_angle_one_random_number_rad(atomic_number, energy_keV)
-                                          for _i in range(number_samples)]
-
-    polar_angles_two_random_numbers_rad = [compute_polar_angle_two_random_numbers_rad(atomic_number, energy_keV)
-                                           for _i in range(number_samples)]
+    rng = np.random.default_rng()
+    histogram_two_random_numbers = accumulate_polar_angle_histogram(atomic_number, energy_keV, number_samples,
+                                                                    rng=rng)
+    histogram_one_random_number = accumulate_polar_angle_histogram(atomic_number, energy_keV, number_samples,
+                                                                   rng=rng, one_random_number=True)
 
     plt.figure()
 
-    plt.hist(polar_angles_two_random_numbers_rad, bins=100, normed=True, label='2 RNs', histtype='step')
-    plt.hist(polar_angles_one_random_number_rad, bins=100, normed=True, label='1 RN', histtype='step')
+    plt.stairs(histogram_two_random_numbers.densities(), histogram_two_random_numbers.bin_edges, label='2 RNs')
+    plt.stairs(histogram_one_random_number.densities(), histogram_one_random_number.bin_edges, label='1 RN')
 
     plt.xlabel(r"Scattering Angle (rad)")
     plt.ylabel(r"Probabilities")
@@ -191,21 +189,12 @@ def plot_compute_differential_cross_section():
     print("Ratio = {:.4f}" .format(ratio))
     print("Ratio/(1 + Ratio) = %.4f" % (ratio/(1.0 + ratio)))
 
-    polar_angles_two_random_numbers_rad = [compute_polar_angle_two_random_numbers_rad(atomic_number, energy_keV)
-                                           for _i in range(number_samples)]
-
-    histogram, bin_edges = np.histogram(polar_angles_two_random_numbers_rad, numbins=number_bins)
-    bin_size = bin_edges[1] - bin_edges[0]
-    histogram /= number_samples*bin_size
-    histogram *= total_A2
-
-    max_range = bin_edges + bin_size*number_bins
-    thetas_rad = np.arange(bin_edges, max_range, bin_size)
+    histogram = accumulate_polar_angle_histogram(atomic_number, energy_keV, number_samples, number_bins)
+    bin_size = histogram.bin_widths[0]
 
     plt.figure()
 
-    # plt.hist(polar_angles_two_random_numbers_rad, bins=100, normed=True, histtype='step')
-    plt.semilogy(thetas_rad, histogram)
+    plt.semilogy(histogram.bin_centers, histogram.densities() * total_A2)
 
     plt.xlabel(r"Scattering Angle (rad)")
     plt.ylabel(r"Probabilities (A2/sr)")
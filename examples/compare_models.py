@@ -51,28 +51,21 @@ def compare_total():
 
     Z = atomic_number
 
-    crossSections_cm2 = [total_elastic_cross_section_rutherford_cm2(Z, E_keV) for E_keV in energies_keV]
-    crossSections_nm2 = np.array(crossSections_cm2)*1.0e14
+    crossSections_cm2 = total_elastic_cross_section_rutherford_cm2(Z, energies_keV)
+    crossSections_nm2 = crossSections_cm2*1.0e14
     plt.plot(energies_keV, crossSections_nm2, '--', label="Rutherford")
 
-    crossSections_cm2 = [total_elastic_cross_section_browning1991a_cm2(Z, E_keV) for E_keV in energies_keV]
-    crossSections_nm2 = np.array(crossSections_cm2)*1.0e14
+    crossSections_cm2 = total_elastic_cross_section_browning1991a_cm2(Z, energies_keV)
+    crossSections_nm2 = crossSections_cm2*1.0e14
     plt.plot(energies_keV, crossSections_nm2, label="Browning")
 
     filename = "CS_{}.bin".format(element)
     filepath = os.path.join(path, filename)
     elsepa_file = ElsepaBinaryFile(filepath)
 
-    casino_energies_keV = []
-    totals_nm2 = []
-    for data in elsepa_file._els_cs_info_list:
-        energy_keV = data._energy_keV
-        total_nm2 = data._total_cs_nm2
-
-        casino_energies_keV.append(energy_keV)
-        totals_nm2.append(total_nm2)
-
-    crossSections_nm2 = np.array(totals_nm2)
+    casino_energies_keV = energies_keV[(energies_keV >= elsepa_file.energies_keV.min()) &
+                                       (energies_keV <= elsepa_file.energies_keV.max())]
+    crossSections_nm2 = elsepa_file.interpolate_total_cs_nm2(casino_energies_keV, log_log=True)
     plt.plot(casino_energies_keV, crossSections_nm2, label="ELSEPA CASINO")
 
     plt.xlabel("Electron Energy (keV)")
@@ -20,15 +20,16 @@ import os.path
 import matplotlib.pyplot as plt
 
 # Local modules.
-import DatabasesTools.Casino3.ElsepaBinaryFile as ElsepaBinaryFile
+from eecs.models.elsepa_binary_file import read_energies_totals
 from eecs.models.elsepa_casino import ElsepaCasino
-from eecs import current_module_path
+from eecs import get_current_module_path
 
 # Globals and constants variables.
 
 def run():
     path = r"D:\work\data\Casino3\ELDB"
-    zipfilepath = current_module_path(__file__, "../testdata/ELSEPA_AbsorptionCorrection_LinearInterpolationTabulation_0.1.zip")
+    zipfilepath = get_current_module_path(
+        __file__, "../testdata/ELSEPA_AbsorptionCorrection_LinearInterpolationTabulation_0.1.zip")
 
     atomicNumbers = range(1, 99+1)
     totalCS_nm2 = {}
@@ -41,12 +42,9 @@ def run():
 
         filename = "EL%i.els" % (atomicNumber)
         filepath = os.path.join(path, filename)
-        elsepaFile = ElsepaBinaryFile.ElsepaBinaryFile(filepath)
-
-        for data in elsepaFile._els_cs_info_list:
-            energy_keV = data._energy_keV
-            total = data._total_cs_nm2
+        energies_keV, totals_nm2 = read_energies_totals(filepath)
 
+        for energy_keV, total in zip(energies_keV, totals_nm2):
             totalCS_nm2[atomicNumber][energy_keV] = total
 
             energy_eV = energy_keV * 1.0e3
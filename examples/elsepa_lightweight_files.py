@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: elsepa_lightweight_files
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Measure the size, load time and accuracy of lighter-weight ELSEPA files.
+"""
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+
+# Standard library modules.
+import os.path
+import tempfile
+import timeit
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+from eecs import get_current_module_path
+from eecs.models.elsepa_binary_file import ElsepaBinaryFile, write_elsepa_file, resample_angular_grid
+from eecs.models.elsepa_table import ElsepaTable
+
+# Globals and constants variables.
+NUMBER_REPEATS = 5
+
+
+def load_time_ms(function, filepath):
+    return min(timeit.repeat(lambda: function(filepath), number=1, repeat=NUMBER_REPEATS)) * 1.0e3
+
+
+def maximum_cdf_error(table_ref, table):
+    errors = [np.max(np.abs(np.interp(table_ref.theta_rad, table.get_theta_rad(index), table.ratios[index]) -
+                            table_ref.ratios[index]))
+              for index in range(len(table_ref))]
+    return max(errors)
+
+
+def run():
+    filepath = get_current_module_path(__file__, "../test_data/casino3/EL29.els")
+    els_file = ElsepaBinaryFile(filepath)
+    table_ref = els_file.get_table()
+
+    print("{:30s} {:>8s} {:>10s} {:>10s} {:>12s}".format("File", "Points", "Size (kB)", "Load (ms)", "CDF error"))
+    print("{:30s} {:8d} {:10.1f} {:10.3f} {:12.3e}".format("Original", table_ref.number_points,
+                                                           os.path.getsize(filepath) / 1024.0,
+                                                           load_time_ms(ElsepaBinaryFile, filepath), 0.0))
+
+    with tempfile.TemporaryDirectory() as path:
+        for maximum_error in [1.0e-6, 1.0e-5, 1.0e-4, 1.0e-3]:
+            els_cs_info_list, error = resample_angular_grid(els_file, maximum_error)
+            resampled_filepath = os.path.join(path, "EL29_{:.0e}.els".format(maximum_error))
+            write_elsepa_file(resampled_filepath, els_cs_info_list)
+
+            print("{:30s} {:8d} {:10.1f} {:10.3f} {:12.3e}".format(
+                "Resampled {:.0e}".format(maximum_error), els_cs_info_list[0]._number_points,
+                os.path.getsize(resampled_filepath) / 1024.0, load_time_ms(ElsepaBinaryFile, resampled_filepath),
+                error))
+
+        float32_filepath = os.path.join(path, "EL29.npz")
+        table_ref.save(float32_filepath, dtype=np.float32)
+        table = ElsepaTable.load(float32_filepath)
+        print("{:30s} {:8d} {:10.1f} {:10.3f} {:12.3e}".format(
+            "float32 companion", table.number_points, os.path.getsize(float32_filepath) / 1024.0,
+            load_time_ms(ElsepaTable.load, float32_filepath), maximum_cdf_error(table_ref, table)))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    run()
@@ -26,6 +26,7 @@ A Pytest local plugin for testing the project.
 
 # Standard library modules.
 import os.path
+from zipfile import ZipFile
 
 # Third party modules.
 import pytest
@@ -34,6 +35,7 @@ import pytest
 
 # Project modules.
 from eecs.models.elsepa_binary_file import ElsepaBinaryFile
+from eecs.models.elsepa_casino import get_member_name
 from eecs import get_current_module_path
 
 # Globals and constants variables.
@@ -70,3 +72,26 @@ def el29_file_path():
 def el29_file(el29_file_path):
     els_file = ElsepaBinaryFile(el29_file_path)
     return els_file
+
+
+@pytest.fixture
+def zip_file_path():
+    file_path = "../test_data/ELSEPA_AbsorptionCorrection_LinearInterpolationTabulation_0.1.zip"
+    file_path = get_current_module_path(__file__, file_path)
+    if not os.path.isfile(file_path):
+        pytest.skip("No file: {}".format(file_path))
+    return file_path
+
+
+@pytest.fixture
+def multiple_elements_zip_file_path(zip_file_path, tmp_path):
+    """
+    Archive with the carbon tables copied for several elements.
+    """
+    filepath = tmp_path / "elsepa_casino.zip"
+    with ZipFile(zip_file_path) as input_file, ZipFile(filepath, mode='w') as output_file:
+        for atomic_number in [6, 8, 13, 14, 29]:
+            for prefix in ["T_", "A_", "P_"]:
+                data = input_file.read(get_member_name(prefix, 6))
+                output_file.writestr(get_member_name(prefix, atomic_number), data)
+    return filepath
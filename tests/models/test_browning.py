@@ -25,14 +25,24 @@ Tests for the module :py:mod:`eecs.models.browning`.
 ###############################################################################
 
 # Standard library modules.
+import tracemalloc
 
 # Third party modules.
+import numpy as np
+import pytest
 from pytest import approx
+from scipy.integrate import quad
+from scipy.stats import kstest
 
 # Local modules.
 
 # Project modules
-from eecs.models.browning import total_elastic_cross_section_browning1994_cm2, polar_angle_rad
+import eecs.models.browning
+from eecs.models.browning import total_elastic_cross_section_browning1994_cm2, polar_angle_rad, \
+    ratio_browning1994, sample_polar_angles_rad, compute_polar_angle_two_random_numbers_rad, \
+    compute_polar_angle_one_random_number_rad, compute_mean_theta_browning_rad, compute_mean_theta_total_browning, \
+    total_elastic_cross_section_browning1991a_cm2, StreamingHistogram, accumulate_polar_angle_histogram, \
+    accumulate_polar_angle_histogram_parallel
 
 # Globals and constants variables.
 
@@ -137,3 +147,276 @@ def test_angle_rad():
         atomic_number, energy_keV, random_number1, random_number2 = key
         angle_rad = polar_angle_rad(atomic_number, energy_keV, random_number1, random_number2)
         assert angles_rad_ref[key] == approx(angle_rad, 6)
+
+
+@pytest.mark.parametrize("name, arguments, value_ref", [
+    ("total_elastic_cross_section_rutherford_cm2", (79, 1.0), 1.5121968473907676e-15),
+    ("compute_screening_parameter", (79, 1.0), 0.06351686700637839),
+    ("average_scattering_angle_rutherford_deg", (79, 1.0), 35.35008915064351),
+    ("average_scattering_angle_rutherford_decreased_screening_deg", (79, 10.0), 10.156405864447768),
+    ("compute_decreased_screening_parameter", (79, 10.0), 0.0035887029858603786),
+    ("total_elastic_cross_section_browning1991a_cm2", (29, 5.0), 7.519981580819548e-17),
+    ("compute_factor_u", (29, 5.0), 0.05125210346381794),
+    ("total_elastic_cross_section_browning1994_cm2", (29, 5.0), 1.0575846726119882e-16),
+    ("differential_cross_section_browning1991_cm2_sr", (79, 1.0, 0.5), 2.900290109392913e-16),
+    ("compute_screening_parameter_browning1991", (79, 1.0), 0.01027478730985533),
+    ("ratio_browning1994", (29, 5.0), 50.547294606101396),
+    ("ratio_browning1994_mcx_ray", (29, 5.0), 50.9375186061014),
+])
+def test_scalar_values(name, arguments, value_ref):
+    function = getattr(eecs.models.browning, name)
+    assert value_ref == approx(function(*arguments), rel=1.0e-12, abs=0.0)
+
+
+@pytest.mark.parametrize("name", [
+    "total_elastic_cross_section_rutherford_cm2",
+    "compute_screening_parameter",
+    "average_scattering_angle_rutherford_deg",
+    "average_scattering_angle_rutherford_decreased_screening_deg",
+    "compute_decreased_screening_parameter",
+    "total_elastic_cross_section_browning1991a_cm2",
+    "compute_factor_u",
+    "total_elastic_cross_section_browning1994_cm2",
+    "compute_screening_parameter_browning1991",
+    "ratio_browning1994",
+    "ratio_browning1994_mcx_ray",
+])
+def test_broadcast_atomic_number_energy(name):
+    function = getattr(eecs.models.browning, name)
+    atomic_numbers = np.array([1, 6, 13, 29, 79, 92])
+    energies_keV = np.array([0.1, 1.0, 5.0, 20.0, 100.0])
+
+    values = function(atomic_numbers[:, np.newaxis], energies_keV)
+    assert values.shape == (len(atomic_numbers), len(energies_keV))
+
+    values_ref = [[function(int(atomic_number), float(energy_keV)) for energy_keV in energies_keV]
+                  for atomic_number in atomic_numbers]
+    assert np.allclose(values_ref, values, rtol=1.0e-14, atol=0.0)
+
+
+def test_broadcast_differential_cross_section():
+    atomic_numbers = np.array([6, 29, 79])
+    energies_keV = np.array([1.0, 10.0])
+    thetas_rad = np.linspace(0.1, np.pi, 7)
+
+    values = eecs.models.browning.differential_cross_section_browning1991_cm2_sr(
+        atomic_numbers[:, np.newaxis, np.newaxis], energies_keV[:, np.newaxis], thetas_rad)
+    assert values.shape == (3, 2, 7)
+
+    for index, atomic_number in enumerate(atomic_numbers):
+        for energy_id, energy_keV in enumerate(energies_keV):
+            values_ref = [eecs.models.browning.differential_cross_section_browning1991_cm2_sr(
+                int(atomic_number), float(energy_keV), float(theta_rad)) for theta_rad in thetas_rad]
+            assert np.allclose(values_ref, values[index, energy_id], rtol=1.0e-14, atol=0.0)
+
+
+def test_broadcast_polar_angle_rad():
+    random_numbers1 = np.array([0.0, 0.1, 0.5, 0.9, 1.0])
+    random_numbers2 = np.array([0.0, 0.5, 1.0])
+    energies_keV = np.array([1.0, 20.0, 100.0])
+
+    angles_rad = polar_angle_rad(6, energies_keV[:, np.newaxis, np.newaxis], random_numbers1[:, np.newaxis],
+                                 random_numbers2)
+    assert angles_rad.shape == (3, 5, 3)
+
+    for energy_id, energy_keV in enumerate(energies_keV):
+        for index1, random_number1 in enumerate(random_numbers1):
+            for index2, random_number2 in enumerate(random_numbers2):
+                angle_ref_rad = polar_angle_rad(6, float(energy_keV), float(random_number1), float(random_number2))
+                assert angle_ref_rad == angles_rad[energy_id, index1, index2]
+
+
+def polar_angle_cdf(atomic_number, energy_keV, angles_rad):
+    ratio = ratio_browning1994(atomic_number, energy_keV)
+    probability = ratio / (1.0 + ratio)
+    alpha = 7.0e-3 / energy_keV
+    x = (1.0 - np.cos(angles_rad)) / 2.0
+    return probability * x * (1.0 + alpha) / (alpha + x) + (1.0 - probability) * x
+
+
+@pytest.mark.parametrize("atomic_number, energy_keV", [(6, 1.0), (79, 1.0), (79, 20.0)])
+def test_sample_polar_angles_rad(atomic_number, energy_keV):
+    rng = np.random.default_rng(2021)
+    angles_rad = sample_polar_angles_rad(atomic_number, energy_keV, 100000, rng)
+
+    assert angles_rad.shape == (100000,)
+    assert np.all(angles_rad >= 0.0) and np.all(angles_rad <= np.pi)
+
+    result = kstest(angles_rad, lambda x: polar_angle_cdf(atomic_number, energy_keV, x))
+    assert result.pvalue > 1.0e-3
+
+
+def test_sample_polar_angles_rad_generator():
+    angles_rad = sample_polar_angles_rad(79, 1.0, (2, 3), np.random.default_rng(2021))
+    assert angles_rad.shape == (2, 3)
+    assert np.array_equal(angles_rad, sample_polar_angles_rad(79, 1.0, (2, 3), np.random.default_rng(2021)))
+
+    energies_keV = np.array([1.0, 10.0, 100.0])
+    angles_rad = sample_polar_angles_rad(79, energies_keV, 3, np.random.default_rng(2021))
+    assert angles_rad.shape == (3,)
+
+    rng = np.random.default_rng(2021)
+    random_numbers1, random_numbers2 = rng.random(), rng.random()
+    angle_ref_rad = polar_angle_rad(79, 1.0, random_numbers1, random_numbers2)
+    angle_rad = compute_polar_angle_two_random_numbers_rad(79, 1.0, np.random.default_rng(2021))
+    assert angle_ref_rad == angle_rad
+
+
+def test_compute_polar_angle_global_seed():
+    np.random.seed(2021)
+    angles_ref_rad = [compute_polar_angle_two_random_numbers_rad(79, 1.0),
+                      compute_polar_angle_one_random_number_rad(79, 1.0)]
+    np.random.seed(2021)
+    angles_rad = [compute_polar_angle_two_random_numbers_rad(79, 1.0),
+                  compute_polar_angle_one_random_number_rad(79, 1.0)]
+    assert angles_ref_rad == angles_rad
+
+    np.random.seed(2021)
+    random_number1, random_number2 = np.random.random(), np.random.random()
+    assert angles_ref_rad[0] == polar_angle_rad(79, 1.0, random_number1, random_number2)
+
+
+@pytest.mark.parametrize("atomic_number, energy_keV", [(6, 1.0), (79, 1.0), (79, 20.0), (29, 100.0)])
+def test_compute_mean_theta_browning_rad(atomic_number, energy_keV):
+    def integrand(angle_rad):
+        return angle_rad * np.sin(angle_rad) * polar_angle_pdf(atomic_number, energy_keV, angle_rad)
+
+    mean_theta_ref_rad = quad(integrand, 0.0, np.pi, points=[7.0e-3 / energy_keV], limit=200)[0]
+
+    assert mean_theta_ref_rad == approx(compute_mean_theta_browning_rad(atomic_number, energy_keV), rel=1.0e-8)
+
+
+def polar_angle_pdf(atomic_number, energy_keV, angle_rad):
+    """
+    Probability density per unit cos(theta) of the polar angle sampled by :py:func:`polar_angle_rad`.
+    """
+    ratio = ratio_browning1994(atomic_number, energy_keV)
+    probability = ratio / (1.0 + ratio)
+    alpha = 7.0e-3 / energy_keV
+    x = (1.0 - np.cos(angle_rad)) / 2.0
+    return (probability * alpha * (1.0 + alpha) / (alpha + x)**2 + (1.0 - probability)) / 2.0
+
+
+def test_compute_mean_theta_total_browning():
+    atomic_numbers = np.array([6, 29, 79])
+    energies_eV = np.array([1.0e3, 5.0e3, 2.0e4])
+
+    mean_thetas_rad, totals_nm2 = compute_mean_theta_total_browning(atomic_numbers[:, np.newaxis], energies_eV)
+    assert mean_thetas_rad.shape == (3, 3)
+    assert totals_nm2.shape == (3, 3)
+    assert totals_nm2[1, 1] == approx(total_elastic_cross_section_browning1991a_cm2(29, 5.0) * 1.0e14)
+
+    for index, atomic_number in enumerate(atomic_numbers):
+        for energy_id, energy_eV in enumerate(energies_eV):
+            mean_theta_rad, total_nm2 = compute_mean_theta_total_browning(int(atomic_number), float(energy_eV),
+                                                                          method="monte_carlo",
+                                                                          number_samples=200000, number_bins=1000,
+                                                                          rng=np.random.default_rng(2021))
+            assert mean_thetas_rad[index, energy_id] == approx(mean_theta_rad, rel=1.0e-2)
+            assert totals_nm2[index, energy_id] == approx(total_nm2, rel=1.0e-12)
+
+    with pytest.raises(ValueError):
+        compute_mean_theta_total_browning(6, 1.0e3, method="quadrature")
+
+
+def test_streaming_histogram():
+    rng = np.random.default_rng(2021)
+    values = rng.normal(0.5, 0.3, 100000)
+
+    histogram = StreamingHistogram(20, 0.0, 1.0)
+    assert 20 == histogram.number_bins
+    assert np.all(histogram.densities() == 0.0)
+
+    for chunk in np.array_split(values, 7):
+        histogram.add(chunk)
+    histogram.add(np.array([1.0]))
+
+    counts_ref, bin_edges_ref = np.histogram(np.append(values, 1.0), bins=20, range=(0.0, 1.0))
+    assert np.array_equal(counts_ref, histogram.counts)
+    assert np.allclose(bin_edges_ref, histogram.bin_edges)
+    assert len(values) + 1 == histogram.number_values
+
+    fraction_in_range = np.sum(histogram.counts) / histogram.number_values
+    assert fraction_in_range == approx(np.sum(histogram.densities() * histogram.bin_widths))
+
+    with pytest.raises(ValueError):
+        StreamingHistogram(10, 1.0, 1.0)
+
+
+def test_accumulate_polar_angle_histogram():
+    rng = np.random.default_rng(2021)
+    histogram = accumulate_polar_angle_histogram(79, 1.0, 250000, number_bins=50, chunk_size=100000, rng=rng)
+
+    rng = np.random.default_rng(2021)
+    angles_rad = np.concatenate([sample_polar_angles_rad(79, 1.0, number_samples, rng)
+                                 for number_samples in [100000, 100000, 50000]])
+    counts_ref, _bin_edges = np.histogram(angles_rad, bins=50, range=(0.0, np.pi))
+    assert np.array_equal(counts_ref, histogram.counts)
+    assert 1.0 == approx(np.sum(histogram.densities() * histogram.bin_widths))
+
+    histogram = accumulate_polar_angle_histogram(79, 1.0, 1000, rng=np.random.default_rng(2021),
+                                                 one_random_number=True)
+    assert 1000 == histogram.number_values
+
+
+def test_accumulate_polar_angle_histogram_memory():
+    peak_sizes = []
+    for number_samples in [100000, 1000000]:
+        tracemalloc.start()
+        accumulate_polar_angle_histogram(79, 1.0, number_samples, chunk_size=50000, rng=np.random.default_rng(2021))
+        _current_size, peak_size = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_sizes.append(peak_size)
+
+    assert peak_sizes[1] < 1.5 * peak_sizes[0]
+
+
+def test_streaming_histogram_merge():
+    rng = np.random.default_rng(2021)
+    values = rng.random(1000)
+
+    histogram = StreamingHistogram(10, 0.0, 1.0)
+    histogram.add(values)
+    assert np.mean(values) == approx(histogram.mean)
+    assert np.var(values) == approx(histogram.variance)
+
+    histogram1 = StreamingHistogram(10, 0.0, 1.0)
+    histogram1.add(values[:300])
+    histogram2 = StreamingHistogram(10, 0.0, 1.0)
+    histogram2.add(values[300:])
+    histogram1.merge(histogram2)
+
+    assert np.array_equal(histogram.counts, histogram1.counts)
+    assert histogram.number_values == histogram1.number_values
+    assert histogram.sum_values == approx(histogram1.sum_values)
+    assert histogram.sum_squared_values == approx(histogram1.sum_squared_values)
+
+    with pytest.raises(ValueError):
+        histogram.merge(StreamingHistogram(20, 0.0, 1.0))
+
+
+@pytest.mark.parametrize("use_threads", [False, True])
+def test_accumulate_polar_angle_histogram_parallel(use_threads):
+    histogram = accumulate_polar_angle_histogram_parallel(79, 1.0, 100003, number_bins=50, chunk_size=10000,
+                                                          seed=2021, number_workers=3, use_threads=use_threads)
+    assert 100003 == histogram.number_values
+    assert 100003 == np.sum(histogram.counts)
+    assert compute_mean_theta_browning_rad(79, 1.0) == approx(histogram.mean, rel=1.0e-2)
+
+    histogram_repeated = accumulate_polar_angle_histogram_parallel(79, 1.0, 100003, number_bins=50, chunk_size=10000,
+                                                                   seed=2021, number_workers=3)
+    assert np.array_equal(histogram.counts, histogram_repeated.counts)
+    assert histogram.sum_values == histogram_repeated.sum_values
+    assert histogram.sum_squared_values == histogram_repeated.sum_squared_values
+
+    seed_sequences = np.random.SeedSequence(2021).spawn(3)
+    histogram_ref = StreamingHistogram(50, 0.0, np.pi)
+    for seed_sequence, number_samples in zip(seed_sequences, [33335, 33334, 33334]):
+        histogram_ref.merge(accumulate_polar_angle_histogram(79, 1.0, number_samples, 50, 10000,
+                                                             np.random.default_rng(seed_sequence)))
+    assert np.array_equal(histogram_ref.counts, histogram.counts)
+    assert histogram_ref.sum_values == histogram.sum_values
+
+    histogram_other_seed = accumulate_polar_angle_histogram_parallel(79, 1.0, 100003, number_bins=50, seed=2022,
+                                                                     number_workers=3, use_threads=True)
+    assert not np.array_equal(histogram.counts, histogram_other_seed.counts)
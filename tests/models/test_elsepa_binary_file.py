@@ -26,13 +26,18 @@ Tests for the :py:mod:`eecs.models.elsepa_binary_file` module.
 ###############################################################################
 
 # Standard library modules.
+import logging
 
 # Third party modules.
+import numpy as np
+import pytest
 from pytest import approx
 
 # Local modules.
 
 # Project modules.
+from eecs.models.elsepa_binary_file import ElsepaBinaryFile, read_energies_totals, iter_els_cs_info, \
+    write_elsepa_file, resample_angular_grid
 
 # Globals and constants variables.
 
@@ -86,3 +91,203 @@ def test_read_file(el29_file_path, el29_file):
 
     assert 0.999999999788251 == approx(els_cs_info._ratios[-1])
     assert 3.13286600763917 == approx(els_cs_info._theta_rad[-2])
+
+
+def test_lazy(el29_file_path, el29_file):
+    with ElsepaBinaryFile(el29_file_path, lazy=True) as els_file:
+        assert 48 == len(els_file)
+        assert all(els_cs_info is None for els_cs_info in els_file._els_cs_info_list)
+        assert np.array_equal(el29_file.energies_keV, els_file.energies_keV)
+        assert np.array_equal(el29_file._offsets, els_file._offsets)
+
+        els_cs_info = els_file.get_els_cs_info(-1)
+        assert els_cs_info is els_file._els_cs_info_list[-1]
+        assert els_cs_info is els_file.get_els_cs_info(47)
+        assert els_file._els_cs_info_list[0] is None
+
+        els_cs_info_ref = el29_file._els_cs_info_list[-1]
+        assert els_cs_info_ref._energy_keV == els_cs_info._energy_keV
+        assert els_cs_info_ref._total_cs_nm2 == els_cs_info._total_cs_nm2
+        assert np.array_equal(els_cs_info_ref._ratios, els_cs_info._ratios)
+        assert np.array_equal(els_cs_info_ref._theta_rad, els_cs_info._theta_rad)
+
+        assert els_cs_info is els_file.get_els_cs_info_by_energy(500.0)
+        assert 47 * 9728 == els_file.get_offset(500.0)
+        with pytest.raises(KeyError):
+            els_file.get_offset(123.4)
+
+    assert els_file._buffer is None
+    assert els_cs_info is els_file.get_els_cs_info(-1)
+    with pytest.raises(ValueError):
+        els_file.get_els_cs_info(0)
+
+
+def test_interpolate_total_cs_nm2(el29_file_path, el29_file):
+    energies_keV = el29_file.energies_keV
+    totals_nm2 = el29_file.total_cs_nm2
+
+    assert np.allclose(totals_nm2, el29_file.interpolate_total_cs_nm2(energies_keV))
+    assert np.allclose(totals_nm2, el29_file.interpolate_total_cs_nm2(energies_keV, log_log=True))
+
+    energy_keV = 0.5 * (energies_keV[10] + energies_keV[11])
+    total_nm2 = el29_file.interpolate_total_cs_nm2(energy_keV)
+    assert 0.5 * (totals_nm2[10] + totals_nm2[11]) == approx(total_nm2)
+
+    energy_keV = np.sqrt(energies_keV[10] * energies_keV[11])
+    total_nm2 = el29_file.interpolate_total_cs_nm2(energy_keV, log_log=True)
+    assert np.sqrt(totals_nm2[10] * totals_nm2[11]) == approx(total_nm2)
+
+    with pytest.raises(ValueError):
+        el29_file.interpolate_total_cs_nm2([0.01, 1.0])
+    with pytest.raises(ValueError):
+        el29_file.interpolate_total_cs_nm2(1000.0)
+
+
+def test_interpolate(el29_file_path, el29_file):
+    energies_keV = np.array([0.1, 1.0, 2.345, 500.0])
+
+    with ElsepaBinaryFile(el29_file_path, lazy=True) as els_file:
+        totals_nm2, ratios, thetas_rad = els_file.interpolate(energies_keV, log_log=True)
+        number_decoded = sum(els_cs_info is not None for els_cs_info in els_file._els_cs_info_list)
+        assert number_decoded < len(els_file)
+
+    assert (4,) == totals_nm2.shape
+    assert (4, 606) == ratios.shape
+    assert (4, 606) == thetas_rad.shape
+
+    els_cs_info = el29_file._els_cs_info_list[0]
+    assert els_cs_info._total_cs_nm2 == approx(totals_nm2[0])
+    assert np.allclose(els_cs_info._ratios, ratios[0])
+    assert np.allclose(els_cs_info._theta_rad, thetas_rad[0])
+    els_cs_info = el29_file._els_cs_info_list[-1]
+    assert np.allclose(els_cs_info._ratios, ratios[-1])
+
+    assert np.all(np.diff(ratios, axis=1) >= 0.0)
+    assert 1.0 == approx(ratios[2, -1])
+    assert np.allclose(el29_file._els_cs_info_list[0]._theta_rad, thetas_rad[2])
+
+    totals_nm2, ratios, thetas_rad = el29_file.interpolate(2.345)
+    assert () == totals_nm2.shape
+    assert (606,) == ratios.shape
+
+
+def test_read_energies_totals(el29_file_path, el29_file):
+    energies_keV, total_cs_nm2 = read_energies_totals(el29_file_path)
+
+    assert (48,) == energies_keV.shape
+    assert (48,) == total_cs_nm2.shape
+    assert np.array_equal(el29_file.energies_keV, energies_keV)
+    assert np.array_equal(el29_file.total_cs_nm2, total_cs_nm2)
+
+    assert 0.1 == approx(energies_keV[0])
+    assert 2.870967e-02 == approx(total_cs_nm2[0])
+    assert 500.0 == approx(energies_keV[-1])
+    assert 0.000247381469262322 == approx(total_cs_nm2[-1])
+
+
+def test_read_file_no_error_log(el29_file_path, caplog):
+    with caplog.at_level(logging.ERROR):
+        els_file = ElsepaBinaryFile(el29_file_path)
+
+    assert 48 == len(els_file)
+    assert [] == caplog.records
+
+
+def test_iter_els_cs_info(el29_file_path, el29_file, caplog):
+    with caplog.at_level(logging.ERROR):
+        els_cs_info_list = [els_cs_info for els_cs_info in iter_els_cs_info(el29_file_path)
+                            if els_cs_info._energy_keV > 1.0]
+    assert [] == caplog.records
+
+    energies_keV = el29_file.energies_keV[el29_file.energies_keV > 1.0]
+    assert len(energies_keV) == len(els_cs_info_list)
+    assert np.array_equal(energies_keV, [els_cs_info._energy_keV for els_cs_info in els_cs_info_list])
+
+    maximum_total_nm2 = max(els_cs_info._total_cs_nm2 for els_cs_info in iter_els_cs_info(el29_file_path))
+    assert np.max(el29_file.total_cs_nm2) == maximum_total_nm2
+
+    assert el29_file.energies_keV.tolist() == [els_cs_info._energy_keV for els_cs_info in el29_file]
+
+
+def test_iter_els_cs_info_truncated(el29_file_path, tmp_path, caplog):
+    with open(el29_file_path, 'rb') as file:
+        data = file.read(9728 + 5000)
+    file_path = tmp_path / "EL29_truncated.els"
+    file_path.write_bytes(data)
+
+    with caplog.at_level(logging.ERROR):
+        els_cs_info_list = list(iter_els_cs_info(file_path))
+
+    assert 1 == len(els_cs_info_list)
+    assert 1 == len(caplog.records)
+
+
+def test_read_energies_totals_truncated(el29_file_path, tmp_path, caplog):
+    with open(el29_file_path, 'rb') as file:
+        data = file.read(9728 + 5000)
+    file_path = tmp_path / "EL29_truncated.els"
+    file_path.write_bytes(data)
+
+    with caplog.at_level(logging.ERROR):
+        energies_keV, total_cs_nm2 = read_energies_totals(file_path)
+
+    assert (1,) == energies_keV.shape
+    assert (1,) == total_cs_nm2.shape
+    assert 0.1 == approx(energies_keV[0])
+    assert 1 == len(caplog.records)
+
+
+def test_lazy_truncated(el29_file_path, tmp_path, caplog):
+    with open(el29_file_path, 'rb') as file:
+        data = file.read(9728 + 5000)
+    file_path = tmp_path / "EL29_truncated.els"
+    file_path.write_bytes(data)
+
+    with caplog.at_level(logging.ERROR):
+        with ElsepaBinaryFile(file_path, lazy=True) as els_file:
+            assert 1 == len(els_file)
+            assert 0.1 == approx(els_file.get_els_cs_info(0)._energy_keV)
+
+    assert 1 == len(caplog.records)
+
+
+def test_write_elsepa_file(el29_file_path, el29_file, tmp_path):
+    file_path = tmp_path / "EL29.els"
+    write_elsepa_file(file_path, el29_file)
+
+    with open(el29_file_path, 'rb') as file:
+        data_ref = file.read()
+    assert data_ref == file_path.read_bytes()
+
+
+@pytest.mark.parametrize("maximum_cdf_error", [1.0e-6, 1.0e-4, 1.0e-3])
+def test_resample_angular_grid(el29_file, tmp_path, maximum_cdf_error):
+    els_cs_info_list, maximum_error = resample_angular_grid(el29_file, maximum_cdf_error)
+
+    assert 48 == len(els_cs_info_list)
+    assert maximum_error <= maximum_cdf_error
+
+    number_points = els_cs_info_list[0]._number_points
+    assert number_points < 606
+    els_cs_info_ref = el29_file._els_cs_info_list[0]
+    els_cs_info = els_cs_info_list[0]
+    assert els_cs_info_ref._theta_rad[0] == els_cs_info._theta_rad[0]
+    assert els_cs_info_ref._theta_rad[-1] == els_cs_info._theta_rad[-1]
+    assert els_cs_info_ref._total_cs_nm2 == els_cs_info._total_cs_nm2
+
+    file_path = tmp_path / "EL29_resampled.els"
+    write_elsepa_file(file_path, els_cs_info_list)
+    els_file = ElsepaBinaryFile(file_path)
+    assert 48 == len(els_file)
+    for els_cs_info_ref, els_cs_info in zip(el29_file, els_file):
+        assert number_points == els_cs_info._number_points
+        ratios = np.interp(els_cs_info_ref._theta_rad, els_cs_info._theta_rad, els_cs_info._ratios)
+        assert np.max(np.abs(ratios - els_cs_info_ref._ratios)) <= maximum_cdf_error
+
+
+def test_resample_angular_grid_exact(el29_file):
+    els_cs_info_list, maximum_error = resample_angular_grid(el29_file, 0.0)
+    assert 0.0 == maximum_error
+    assert len(els_cs_info_list[0]._theta_rad) <= 606
+
+    assert ([], 0.0) == resample_angular_grid([], 1.0e-3)
@@ -27,8 +27,12 @@ Tests for the :py:mod:`eecs.models.elsepa_casino` module.
 
 # Standard library modules.
 import os.path
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Third party modules.
+import numpy as np
 import pytest
 from pytest import approx
 
@@ -50,15 +54,6 @@ def test_is_discovered():
     assert True
 
 
-@pytest.fixture
-def zip_file_path():
-    file_path = "../../test_data/ELSEPA_AbsorptionCorrection_LinearInterpolationTabulation_0.1.zip"
-    file_path = get_current_module_path(__file__, file_path)
-    if not os.path.isfile(file_path):
-        pytest.skip("No file: {}".format(file_path))
-    return file_path
-
-
 @pytest.fixture
 def casino_cross_section(zip_file_path):
     cross_section = eecs.models.elsepa_casino.ElsepaCasino(zip_file_path)
@@ -145,3 +140,266 @@ def test_read_partial_data(casino_cross_section):
     assert atomic_number not in casino_cross_section.partial_functions
     casino_cross_section.read_partial_data(atomic_number)
     assert atomic_number in casino_cross_section.partial_functions
+
+
+def test_get_member_name():
+    assert "T_C.txt" == eecs.models.elsepa_casino.get_member_name(eecs.models.elsepa_casino.PREFIX_TOTAL, 6)
+    assert "A_Cu.txt" == eecs.models.elsepa_casino.get_member_name(eecs.models.elsepa_casino.PREFIX_ANGLE, 29)
+
+
+def test_load_element(zip_file_path):
+    """
+    Tests for method :py:meth:`load_element`.
+    """
+
+    atomic_number = 6
+    with eecs.models.elsepa_casino.ElsepaCasino(zip_file_path) as cross_section:
+        assert cross_section._zip_file is None
+        cross_section.load_element(atomic_number)
+        zip_file = cross_section._zip_file
+        assert zip_file is not None
+
+        assert atomic_number in cross_section.total_functions
+        assert atomic_number in cross_section.angle_functions
+        assert atomic_number in cross_section.partial_functions
+
+        cross_section.read_total_data(atomic_number)
+        assert zip_file is cross_section._zip_file
+
+        assert 0.00120146 == approx(cross_section.total_nm2(6, 5.0e3))
+        assert 4.345130434680232 == approx(cross_section.angle_deg(6, 5.0e3, 0.5))
+        assert 0.017259500000000004 == approx(cross_section.partial_nm2_sr(6, 5.0e3, 4.35))
+
+    assert cross_section._zip_file is None
+    assert zip_file.fp is None
+
+
+@pytest.mark.parametrize("name, number_columns", [("T_C.txt", 2), ("A_C.txt", 607), ("P_C.txt", 607)])
+def test_read_table(name, number_columns):
+    file_path = get_current_module_path(__file__, "../../test_data/" + name)
+    if not os.path.isfile(file_path):
+        pytest.skip("No file: {}".format(file_path))
+
+    with open(file_path, 'rb') as file:
+        data = file.read()
+
+    header_items, values = eecs.models.elsepa_casino.read_table(data)
+    assert "Energy (eV)" == header_items[0]
+    assert number_columns == len(header_items)
+    assert (203, number_columns) == values.shape
+    assert np.float64 == values.dtype
+    assert 10.0 == values[0, 0]
+
+    header_items_crlf, values_crlf = eecs.models.elsepa_casino.read_table(data.replace(b"\n", b"\r\n"))
+    assert header_items == header_items_crlf
+    assert np.array_equal(values, values_crlf)
+
+
+def test_read_table_values():
+    data = b"Energy (eV)\t0.0\t90.0\t180.0\r\n10.0\t0.0\t0.5\t1.0\r\n20.0\t0.0\t0.75\t1.0\r\n"
+    header_items, values = eecs.models.elsepa_casino.read_table(data)
+
+    assert ["Energy (eV)", "0.0", "90.0", "180.0"] == header_items
+    assert [[10.0, 0.0, 0.5, 1.0], [20.0, 0.0, 0.75, 1.0]] == values.tolist()
+
+    with pytest.raises(ValueError):
+        eecs.models.elsepa_casino.read_table(b"Energy (eV)\ttotal (nm2)\n10.0\t0.1\t0.2\n")
+
+
+def test_angle_deg_arbitrary_energy(casino_cross_section):
+    """
+    Tests for method :py:meth:`angle_deg` between the tabulated energies.
+    """
+
+    casino_cross_section.read_angle_data(6)
+    energies_eV = casino_cross_section.angle_functions[6].energies_eV
+    row_id = np.searchsorted(energies_eV, 12345.6) - 1
+    lower_energy_eV = energies_eV[row_id]
+    upper_energy_eV = energies_eV[row_id + 1]
+    assert lower_energy_eV < 12345.6 < upper_energy_eV
+
+    lower_angle_deg = casino_cross_section.angle_deg(6, lower_energy_eV, 0.5)
+    upper_angle_deg = casino_cross_section.angle_deg(6, upper_energy_eV, 0.5)
+    angle_deg = casino_cross_section.angle_deg(6, 12345.6, 0.5)
+    weight = (12345.6 - lower_energy_eV) / (upper_energy_eV - lower_energy_eV)
+    assert lower_angle_deg + weight * (upper_angle_deg - lower_angle_deg) == approx(angle_deg)
+    assert upper_angle_deg < angle_deg < lower_angle_deg
+
+    energies_eV = np.array([5.0e3, 12345.6, 12345.6, 2.0e4])
+    random_numbers = np.array([0.5, 0.5, 0.1, 0.9])
+    angles_deg = casino_cross_section.angle_deg(6, energies_eV, random_numbers)
+    assert (4,) == angles_deg.shape
+    assert 4.345130434680232 == approx(angles_deg[0])
+    assert angle_deg == approx(angles_deg[1])
+    assert angles_deg[2] < angles_deg[1] < angles_deg[3]
+
+    angles_deg = casino_cross_section.angle_deg(6, 12345.6, random_numbers)
+    assert (4,) == angles_deg.shape
+
+    with pytest.raises(ValueError):
+        casino_cross_section.angle_deg(6, 1.0, 0.5)
+
+
+def test_angle_deg_log_energy(zip_file_path):
+    cross_section = eecs.models.elsepa_casino.ElsepaCasino(zip_file_path, log_energy=True)
+
+    assert 4.345130434680232 == approx(cross_section.angle_deg(6, 5.0e3, 0.5))
+
+    energies_eV = cross_section.angle_functions[6].energies_eV
+    row_id = np.searchsorted(energies_eV, 12345.6) - 1
+    lower_energy_eV = energies_eV[row_id]
+    upper_energy_eV = energies_eV[row_id + 1]
+    lower_angle_deg = cross_section.angle_deg(6, lower_energy_eV, 0.5)
+    upper_angle_deg = cross_section.angle_deg(6, upper_energy_eV, 0.5)
+    weight = np.log(12345.6 / lower_energy_eV) / np.log(upper_energy_eV / lower_energy_eV)
+    angle_deg = cross_section.angle_deg(6, 12345.6, 0.5)
+    assert lower_angle_deg + weight * (upper_angle_deg - lower_angle_deg) == approx(angle_deg)
+
+
+def test_partial_nm2_sr_arbitrary_energy(casino_cross_section):
+    """
+    Tests for method :py:meth:`partial_nm2_sr` between the tabulated energies.
+    """
+
+    partial_nm2_sr = casino_cross_section.partial_nm2_sr(6, 12345.6, 4.35)
+    energies_eV = casino_cross_section.partial_functions[6].energies_eV
+    row_id = np.searchsorted(energies_eV, 12345.6) - 1
+    lower_partial_nm2_sr = casino_cross_section.partial_nm2_sr(6, energies_eV[row_id], 4.35)
+    upper_partial_nm2_sr = casino_cross_section.partial_nm2_sr(6, energies_eV[row_id + 1], 4.35)
+    assert min(lower_partial_nm2_sr, upper_partial_nm2_sr) <= partial_nm2_sr
+    assert partial_nm2_sr <= max(lower_partial_nm2_sr, upper_partial_nm2_sr)
+
+    partials_nm2_sr = casino_cross_section.partial_nm2_sr(6, [5.0e3, 12345.6], [4.35, 4.35])
+    assert 0.017259500000000004 == approx(partials_nm2_sr[0])
+    assert partial_nm2_sr == approx(partials_nm2_sr[1])
+
+
+def test_concurrent_first_access(zip_file_path):
+    number_threads = 32
+    with eecs.models.elsepa_casino.ElsepaCasino(zip_file_path) as cross_section:
+        read_counts = {"total": 0, "angle": 0, "partial": 0}
+        count_lock = threading.Lock()
+
+        def counting(name, read_data):
+            def read_data_counted(atomic_number):
+                with count_lock:
+                    read_counts[name] += 1
+                time.sleep(0.01)
+                return read_data(atomic_number)
+            return read_data_counted
+
+        cross_section.read_total_data = counting("total", cross_section.read_total_data)
+        cross_section.read_angle_data = counting("angle", cross_section.read_angle_data)
+        cross_section.read_partial_data = counting("partial", cross_section.read_partial_data)
+
+        barrier = threading.Barrier(number_threads)
+
+        def worker(_index):
+            barrier.wait()
+            return (cross_section.total_nm2(6, 5.0e3), cross_section.angle_deg(6, 5.0e3, 0.5),
+                    cross_section.partial_nm2_sr(6, 5.0e3, 10.0))
+
+        with ThreadPoolExecutor(max_workers=number_threads) as executor:
+            results = list(executor.map(worker, range(number_threads)))
+
+    assert read_counts == {"total": 1, "angle": 1, "partial": 1}
+    for result in results:
+        assert np.allclose(results[0], result)
+
+
+def test_cache_info(zip_file_path):
+    with eecs.models.elsepa_casino.ElsepaCasino(zip_file_path) as cross_section:
+        assert cross_section.cache_info() == (0, 0, 0, 0, 0)
+
+        cross_section.total_nm2(6, 5.0e3)
+        cross_section.total_nm2(6, 6.0e3)
+        cross_section.angle_deg(6, 5.0e3, 0.5)
+
+        cache_info = cross_section.cache_info()
+        assert cache_info.hits == 1
+        assert cache_info.misses == 2
+        assert cache_info.evictions == 0
+        assert cache_info.elements == 1
+        assert cache_info.memory_bytes == (cross_section.angle_functions[6].nbytes +
+                                           cross_section.total_functions[6].nbytes)
+
+
+def test_cache_maximum_elements(multiple_elements_zip_file_path):
+    with eecs.models.elsepa_casino.ElsepaCasino(multiple_elements_zip_file_path, maximum_elements=2) as cross_section:
+        total_nm2 = cross_section.total_nm2(6, 5.0e3)
+        cross_section.total_nm2(13, 5.0e3)
+        cross_section.total_nm2(6, 5.0e3)
+        cross_section.total_nm2(29, 5.0e3)
+
+        assert 6 in cross_section.total_functions
+        assert 13 not in cross_section.total_functions
+        assert 29 in cross_section.total_functions
+        assert cross_section.cache_info()[:4] == (1, 3, 1, 2)
+
+        assert cross_section.total_nm2(13, 5.0e3) == approx(total_nm2)
+        assert 6 not in cross_section.total_functions
+        assert cross_section.cache_info()[:4] == (1, 4, 2, 2)
+
+
+def test_cache_maximum_memory_bytes(multiple_elements_zip_file_path):
+    with eecs.models.elsepa_casino.ElsepaCasino(multiple_elements_zip_file_path) as cross_section:
+        cross_section.load_element(6)
+        element_nbytes = cross_section.cache_info().memory_bytes
+
+    with eecs.models.elsepa_casino.ElsepaCasino(multiple_elements_zip_file_path,
+                                                maximum_memory_bytes=2 * element_nbytes) as cross_section:
+        for atomic_number in [6, 13, 29]:
+            cross_section.load_element(atomic_number)
+            cross_section.partial_nm2_sr(atomic_number, 5.0e3, 10.0)
+
+        cache_info = cross_section.cache_info()
+        assert cache_info.evictions == 1
+        assert cache_info.elements == 2
+        assert cache_info.memory_bytes == 2 * element_nbytes
+        assert 6 not in cross_section.angle_functions
+        assert 6 not in cross_section.partial_functions
+
+    with eecs.models.elsepa_casino.ElsepaCasino(multiple_elements_zip_file_path,
+                                                maximum_memory_bytes=1) as cross_section:
+        cross_section.angle_deg(6, 5.0e3, 0.5)
+        cross_section.angle_deg(13, 5.0e3, 0.5)
+
+        cache_info = cross_section.cache_info()
+        assert cache_info.evictions == 1
+        assert cache_info.elements == 1
+        assert list(cross_section.angle_functions) == [13]
+
+
+def test_total_nm2_log_log(zip_file_path):
+    with eecs.models.elsepa_casino.ElsepaCasino(zip_file_path, log_log=True) as cross_section:
+        assert 0.00120146 == approx(cross_section.total_nm2(6, 5.0e3))
+
+        total_element = cross_section.total_functions[6]
+        energies_eV = total_element.energies_eV
+        totals_nm2 = cross_section.total_nm2(6, energies_eV)
+        assert np.allclose(total_element.totals_nm2, totals_nm2, rtol=1.0e-12)
+
+        totals_nm2 = cross_section.total_nm2(6, np.array([[5.0e3, 5.5e3], [6.0e3, 7.0e3]]))
+        assert totals_nm2.shape == (2, 2)
+        assert np.all(np.diff(totals_nm2.ravel()) < 0.0)
+
+        with pytest.raises(ValueError):
+            cross_section.total_nm2(6, [5.0e3, 1.0e9])
+
+
+def test_total_element_coarse_grid(zip_file_path):
+    with eecs.models.elsepa_casino.ElsepaCasino(zip_file_path) as cross_section:
+        total_element = cross_section.read_total_data(6)
+    energies_eV = total_element.energies_eV
+    totals_nm2 = total_element.totals_nm2
+
+    linear_element = eecs.models.elsepa_casino.TotalElement(energies_eV[::2], totals_nm2[::2])
+    log_log_element = eecs.models.elsepa_casino.TotalElement(energies_eV[::8], totals_nm2[::8], log_log=True)
+    mask = energies_eV <= energies_eV[::8][-1]
+
+    linear_error = np.max(np.abs(linear_element(energies_eV[mask]) / totals_nm2[mask] - 1.0))
+    log_log_error = np.max(np.abs(log_log_element(energies_eV[mask]) / totals_nm2[mask] - 1.0))
+    assert log_log_error < linear_error
+
+    with pytest.raises(ValueError):
+        eecs.models.elsepa_casino.TotalElement([1.0, 2.0], [1.0, 0.0], log_log=True)
@@ -27,6 +27,7 @@ Tests for the :py:mod:`eecs.models.elsepa_cross_section_info` module.
 # Standard library modules.
 
 # Third party modules.
+import numpy as np
 from pytest import approx
 
 # Local modules.
@@ -63,3 +64,26 @@ def test_read_file(el29_file_path):
 
     assert 1.0 == approx(els_cs_info ._ratios[-1])
     assert 3.1415926539 == approx(els_cs_info ._theta_rad[-1])
+
+
+def test_read_file_arrays(el29_file_path):
+    with open(el29_file_path, 'rb') as file:
+        els_cs_info = ElsepaCrossSectionInfo()
+        els_cs_info.read_file(file)
+
+        els_cs_info_next = ElsepaCrossSectionInfo()
+        els_cs_info_next.read_file(file)
+
+    for values in [els_cs_info._ratios, els_cs_info._theta_rad]:
+        assert isinstance(values, np.ndarray)
+        assert np.float64 == values.dtype
+        assert (606,) == values.shape
+        assert values.flags.c_contiguous
+
+    assert np.all(np.diff(els_cs_info._ratios) >= 0.0)
+    assert np.all(np.diff(els_cs_info._theta_rad) > 0.0)
+
+    assert 29 == els_cs_info_next._atomic_number
+    assert els_cs_info._energy_keV < els_cs_info_next._energy_keV
+    assert 0.0 == approx(els_cs_info_next._ratios[0])
+    assert 3.1415926539 == approx(els_cs_info_next._theta_rad[-1])
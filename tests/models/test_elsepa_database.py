@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: tests.models.test_elsepa_database
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the :py:mod:`eecs.models.elsepa_database` module.
+"""
+
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import os
+import os.path
+import shutil
+
+# Third party modules.
+import numpy as np
+import pytest
+
+# Local modules.
+
+# Project modules.
+from eecs.models.elsepa_database import load_tables, get_elsepa_filepath, read_cache
+
+# Globals and constants variables.
+
+
+def test_is_discovered():
+    """
+    Test used to validate the file is included in the tests
+    by the test framework.
+    """
+    # assert False
+    assert True
+
+
+@pytest.fixture
+def elsepa_path(el29_file_path):
+    return os.path.dirname(el29_file_path)
+
+
+def test_get_elsepa_filepath(elsepa_path, el29_file_path):
+    assert os.path.normpath(el29_file_path) == os.path.normpath(get_elsepa_filepath(elsepa_path, 29))
+
+
+@pytest.mark.parametrize("use_threads", [True, False])
+def test_load_tables(elsepa_path, el29_file, use_threads):
+    tables, times_s = load_tables(elsepa_path, [29, 29], number_workers=2, use_threads=use_threads)
+
+    assert [29] == list(tables.keys())
+    assert [29] == list(times_s.keys())
+    assert times_s[29] > 0.0
+
+    table = tables[29]
+    assert 29 == table.atomic_number
+    assert np.array_equal(el29_file.energies_keV, table.energies_keV)
+    assert np.array_equal(el29_file.get_table().ratios, table.ratios)
+
+
+def test_load_tables_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_tables(tmp_path, [6], use_threads=True)
+
+    assert ({}, {}) == load_tables(tmp_path, [])
+
+
+def test_load_tables_cache(el29_file_path, tmp_path):
+    elsepa_path = tmp_path / "ELDB"
+    elsepa_path.mkdir()
+    shutil.copy(el29_file_path, elsepa_path / "EL29.els")
+    shutil.copy(el29_file_path, elsepa_path / "EL6.els")
+    cache_filepath = tmp_path / "elsepa_cache.npz"
+
+    tables, times_s = load_tables(elsepa_path, [29], use_threads=True, cache_filepath=cache_filepath)
+    assert [29] == list(times_s.keys())
+    assert os.path.isfile(cache_filepath)
+
+    cached_tables, sources = read_cache(cache_filepath)
+    assert [29] == list(cached_tables.keys())
+    assert os.path.abspath(elsepa_path / "EL29.els") == sources[29]["path"]
+
+    tables_cache, times_s = load_tables(elsepa_path, [29], use_threads=True, cache_filepath=cache_filepath)
+    assert {} == times_s
+    table = tables_cache[29]
+    assert table.has_shared_angular_grid
+    assert np.array_equal(tables[29].energies_keV, table.energies_keV)
+    assert np.array_equal(tables[29].total_cs_nm2, table.total_cs_nm2)
+    assert np.array_equal(tables[29].ratios, table.ratios)
+    assert np.array_equal(tables[29].theta_rad, table.theta_rad)
+
+    tables, times_s = load_tables(elsepa_path, [6, 29], use_threads=True, cache_filepath=cache_filepath)
+    assert [6] == list(times_s.keys())
+    assert [6, 29] == sorted(read_cache(cache_filepath)[0].keys())
+    cached_tables, sources = read_cache(cache_filepath, [29, 79])
+    assert [29] == list(cached_tables.keys())
+    assert [29] == list(sources.keys())
+
+    file_stat = os.stat(elsepa_path / "EL29.els")
+    os.utime(elsepa_path / "EL29.els", ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1000000000))
+    tables, times_s = load_tables(elsepa_path, [6, 29], use_threads=True, cache_filepath=cache_filepath)
+    assert [29] == list(times_s.keys())
+
+    tables, times_s = load_tables(elsepa_path, [6, 29], use_threads=True, cache_filepath=cache_filepath)
+    assert {} == times_s
+
+
+def test_read_cache_invalid(tmp_path):
+    cache_filepath = tmp_path / "elsepa_cache.npz"
+    assert ({}, {}) == read_cache(cache_filepath)
+
+    cache_filepath.write_bytes(b"not a cache")
+    assert ({}, {}) == read_cache(cache_filepath)
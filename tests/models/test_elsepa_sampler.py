@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: tests.models.test_elsepa_sampler
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the :py:mod:`eecs.models.elsepa_sampler` module.
+"""
+
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+
+# Third party modules.
+import numpy as np
+import pytest
+from pytest import approx
+from scipy.stats import kstest
+from scipy.integrate import cumulative_trapezoid
+
+# Local modules.
+
+# Project modules.
+from eecs.models.elsepa_sampler import AngleSampler, AliasAngleSampler, create_alias_table
+from eecs.models.elsepa_casino import ElsepaCasino
+
+# Globals and constants variables.
+
+
+def test_is_discovered():
+    """
+    Test used to validate the file is included in the tests
+    by the test framework.
+    """
+    # assert False
+    assert True
+
+
+@pytest.fixture
+def uniform_sampler():
+    energies_eV = [100.0, 200.0]
+    angles_deg = np.linspace(0.0, 180.0, 181)
+    random_numbers = np.array([np.linspace(0.0, 1.0, 181), (angles_deg / 180.0)**2])
+    return AngleSampler(energies_eV, random_numbers, angles_deg, number_guides=16)
+
+
+def test_guides(uniform_sampler):
+    assert (2, 16) == uniform_sampler.guides.shape
+    assert 0 == uniform_sampler.guides[0, 0]
+    assert 90 == uniform_sampler.guides[0, 8]
+    assert np.all(np.diff(uniform_sampler.guides, axis=1) >= 0)
+
+
+def test_sample_random_numbers(uniform_sampler):
+    random_numbers = np.array([0.0, 0.25, 0.5, 0.999, 1.0])
+
+    angles_deg = uniform_sampler.sample(np.full(5, 100.0), random_numbers=random_numbers)
+    assert np.allclose(180.0 * random_numbers, angles_deg)
+
+    angles_deg = uniform_sampler.sample(np.full(5, 200.0), random_numbers=random_numbers)
+    assert np.allclose(180.0 * np.sqrt(random_numbers), angles_deg, atol=0.1)
+
+    angle_deg = uniform_sampler.sample(150.0, random_numbers=0.25)
+    assert () == angle_deg.shape
+    assert 0.5 * (45.0 + uniform_sampler.sample(200.0, random_numbers=0.25)) == approx(angle_deg)
+
+    with pytest.raises(ValueError):
+        uniform_sampler.sample(50.0, random_numbers=0.5)
+
+
+def test_sample_rng(uniform_sampler):
+    angles_deg = uniform_sampler.sample(np.full(100000, 100.0), rng=np.random.default_rng(12345))
+    assert (100000,) == angles_deg.shape
+    assert 90.0 == approx(np.mean(angles_deg), abs=1.0)
+
+    angles_deg_repeat = uniform_sampler.sample(np.full(100000, 100.0), rng=np.random.default_rng(12345))
+    assert np.array_equal(angles_deg, angles_deg_repeat)
+
+
+def test_sample_elsepa_casino(zip_file_path):
+    with ElsepaCasino(zip_file_path) as cross_section:
+        sampler = cross_section.angle_sampler(6)
+        assert 4.345130434680232 == approx(sampler.sample(5.0e3, random_numbers=0.5))
+
+        rng = np.random.default_rng(2021)
+        energies_eV = rng.uniform(10.0, 3.0e4, 10000)
+        random_numbers = rng.random(10000)
+        angles_deg = sampler.sample(energies_eV, random_numbers=random_numbers)
+        angles_ref_deg = cross_section.angle_deg(6, energies_eV, random_numbers)
+        assert np.allclose(angles_ref_deg, angles_deg, rtol=1.0e-12, atol=1.0e-12)
+
+
+def test_create_alias_table():
+    weights = np.array([1.0, 0.0, 3.0, 0.5, 2.5])
+    probabilities, aliases = create_alias_table(weights)
+
+    bin_probabilities = probabilities.copy()
+    np.add.at(bin_probabilities, aliases, 1.0 - probabilities)
+    assert np.allclose(weights / np.sum(weights), bin_probabilities / len(weights))
+
+    with pytest.raises(ValueError):
+        create_alias_table(np.zeros(3))
+
+
+def test_alias_sample_uniform():
+    angles_deg = np.array([0.0, 90.0, 180.0])
+    partials_nm2_sr = np.ones((2, 3))
+    sampler = AliasAngleSampler([100.0, 1000.0], angles_deg, partials_nm2_sr)
+
+    assert sampler.number_bins == 2
+    assert np.allclose([0.5, 0.5], sampler.weights[0] / np.sum(sampler.weights[0]))
+
+    rng = np.random.default_rng(2021)
+    angles_deg = sampler.sample(np.full(10000, 500.0), rng)
+    assert angles_deg.shape == (10000,)
+    assert np.all(angles_deg >= 0.0) and np.all(angles_deg <= 180.0)
+    assert np.mean(angles_deg < 90.0) == approx(0.5, abs=0.02)
+
+    with pytest.raises(ValueError):
+        sampler.sample(5000.0, rng)
+
+
+def test_alias_sample_distribution(zip_file_path):
+    with ElsepaCasino(zip_file_path) as cross_section:
+        sampler = cross_section.alias_angle_sampler(6)
+        partial_element = cross_section.read_partial_data(6)
+
+    row_id = 100
+    assert partial_element.energies_eV[row_id] == sampler.energies_eV[row_id]
+    angles_rad = np.radians(partial_element.angles_deg)
+    cdf = cumulative_trapezoid(2.0 * np.pi * partial_element.partials_nm2_sr[row_id] * np.sin(angles_rad), angles_rad,
+                               initial=0.0)
+    cdf /= cdf[-1]
+
+    rng = np.random.default_rng(2021)
+    angles_deg = sampler.sample(np.full(100000, sampler.energies_eV[row_id]), rng)
+
+    result = kstest(angles_deg, lambda x: np.interp(x, partial_element.angles_deg, cdf))
+    assert result.pvalue > 1.0e-3
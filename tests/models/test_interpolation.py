@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: tests.models.test_interpolation
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the :py:mod:`eecs.models.interpolation` module.
+"""
+
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+import pytest
+from pytest import approx
+from scipy.interpolate import interp1d
+
+# Local modules.
+
+# Project modules.
+from eecs.models.interpolation import bracket_energies, search_sorted_rows, interpolate_rows
+
+# Globals and constants variables.
+
+
+def test_is_discovered():
+    """
+    Test used to validate the file is included in the tests
+    by the test framework.
+    """
+    # assert False
+    assert True
+
+
+def test_bracket_energies():
+    table_energies = [10.0, 100.0, 1000.0]
+
+    rows, weights = bracket_energies(table_energies, [10.0, 55.0, 100.0, 550.0, 1000.0])
+    assert [0, 0, 1, 1, 1] == rows.tolist()
+    assert np.allclose([0.0, 0.5, 0.0, 0.5, 1.0], weights)
+
+    rows, weights = bracket_energies(table_energies, np.sqrt(10.0 * 100.0), log_energy=True)
+    assert 0 == rows
+    assert 0.5 == approx(weights)
+
+    rows_log, weights_log = bracket_energies(table_energies, np.sqrt(10.0 * 100.0), log_energy=True,
+                                             log_table_energies=np.log(table_energies))
+    assert rows == rows_log
+    assert weights == weights_log
+
+    with pytest.raises(ValueError):
+        bracket_energies(table_energies, [5.0, 50.0])
+    with pytest.raises(ValueError):
+        bracket_energies(table_energies, 1000.1)
+
+
+def test_search_sorted_rows():
+    grids = np.array([[0.0, 1.0, 2.0, 3.0],
+                      [0.0, 0.1, 0.5, 1.0]])
+    values = np.array([-1.0, 0.0, 0.5, 1.0, 3.0, 4.0, 0.05, 0.1, 0.7, 1.0])
+    rows = np.array([0, 0, 0, 0, 0, 0, 1, 1, 1, 1])
+
+    indices = search_sorted_rows(grids, rows, values)
+    indices_ref = [np.searchsorted(grids[row], value) for row, value in zip(rows, values)]
+    assert indices_ref == indices.tolist()
+
+    indices = search_sorted_rows(grids, 1, np.array([[0.05, 0.7], [1.0, 0.0]]))
+    assert [[1, 3], [3, 0]] == indices.tolist()
+    assert (0, 2) == search_sorted_rows(grids, np.zeros((0, 2), dtype=int), 0.5).shape
+
+
+def test_interpolate_rows():
+    rng = np.random.default_rng(2021)
+    grids = np.sort(rng.random((5, 20)), axis=1)
+    grids[:, 0] = 0.0
+    grids[:, -1] = 1.0
+    grid = np.linspace(0.0, 1.0, 20)
+    table_values = rng.random((5, 20))
+
+    rows = rng.integers(0, 5, 1000)
+    values = rng.random(1000)
+    values[:10] = 0.0
+    values[10:20] = 1.0
+    values[20:25] = grids[rows[20:25], 3]
+
+    results = interpolate_rows(grids, table_values[0], rows, values)
+    results_ref = [interp1d(grids[row], table_values[0])(value) for row, value in zip(rows, values)]
+    assert np.array_equal(results_ref, results)
+
+    results = interpolate_rows(grid, table_values, rows, values)
+    results_ref = [interp1d(grid, table_values[row])(value) for row, value in zip(rows, values)]
+    assert np.array_equal(results_ref, results)
+
+    assert interpolate_rows(grid, table_values, 2, 0.5).shape == ()
+
+    with pytest.raises(ValueError):
+        interpolate_rows(grids, table_values[0], [0, 1], [0.5, 1.1])
+    with pytest.raises(ValueError):
+        interpolate_rows(grid, table_values, 0, -0.1)
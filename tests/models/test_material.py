@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: tests.models.test_material
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the :py:mod:`eecs.models.material` module.
+"""
+
+
+###############################################################################
+# Copyright 2021 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+from zipfile import ZipFile
+
+# Third party modules.
+import numpy as np
+import pytest
+from pytest import approx
+
+# Local modules.
+
+# Project modules.
+from eecs.element_properties import compute_atomic_density_atom_cm3, get_atomic_mass_g_mol
+from eecs.models.elsepa_casino import ElsepaCasino, get_member_name
+from eecs.models.material import Material
+
+# Globals and constants variables.
+
+
+def test_is_discovered():
+    """
+    Test used to validate the file is included in the tests
+    by the test framework.
+    """
+    # assert False
+    assert True
+
+
+@pytest.fixture
+def elsepa_casino(multiple_elements_zip_file_path):
+    with ElsepaCasino(multiple_elements_zip_file_path) as elsepa_casino:
+        yield elsepa_casino
+
+
+@pytest.fixture
+def scaled_elsepa_casino(zip_file_path, tmp_path):
+    """
+    Archive with the carbon tables for C and O, with the O total cross sections multiplied by energy / 1 keV.
+    """
+    filepath = tmp_path / "elsepa_casino_scaled.zip"
+    with ZipFile(zip_file_path) as input_file, ZipFile(filepath, mode='w') as output_file:
+        for prefix in ["T_", "A_", "P_"]:
+            output_file.writestr(get_member_name(prefix, 6), input_file.read(get_member_name(prefix, 6)))
+        for prefix in ["A_", "P_"]:
+            output_file.writestr(get_member_name(prefix, 8), input_file.read(get_member_name(prefix, 6)))
+
+        lines = input_file.read(get_member_name("T_", 6)).decode().splitlines()
+        for line_id, line in enumerate(lines[1:], start=1):
+            energy_eV, total_nm2 = (float(item) for item in line.split('\t'))
+            lines[line_id] = "{!r}\t{!r}".format(energy_eV, total_nm2 * energy_eV / 1.0e3)
+        output_file.writestr(get_member_name("T_", 8), "\n".join(lines) + "\n")
+
+    with ElsepaCasino(filepath) as elsepa_casino:
+        yield elsepa_casino
+
+
+def test_pure_element(elsepa_casino):
+    material = Material(elsepa_casino, {6: 1.0}, 2.26)
+
+    atomic_density_atom_nm3 = compute_atomic_density_atom_cm3(2.26, get_atomic_mass_g_mol(6)) * 1.0e-21
+    assert [atomic_density_atom_nm3] == approx(material.atomic_densities_atom_nm3)
+    assert np.array_equal(elsepa_casino.total_element(6).energies_eV, material.energies_eV)
+
+    energies_eV = np.array([1.0e2, 1.0e3, 5.0e3, 2.0e4])
+    inverse_mean_free_paths_1_nm = material.inverse_mean_free_path_1_nm(energies_eV)
+    totals_nm2 = elsepa_casino.total_nm2(6, energies_eV)
+    assert np.allclose(atomic_density_atom_nm3 * totals_nm2, inverse_mean_free_paths_1_nm, rtol=1.0e-2)
+    assert np.allclose(1.0 / inverse_mean_free_paths_1_nm, material.mean_free_path_nm(energies_eV))
+
+    inverse_mean_free_paths_1_nm = material.inverse_mean_free_path_1_nm(material.energies_eV)
+    assert np.allclose(atomic_density_atom_nm3 * elsepa_casino.total_element(6).totals_nm2,
+                       inverse_mean_free_paths_1_nm, rtol=1.0e-12)
+
+    assert np.all(material.choose_element(energies_eV, rng=np.random.default_rng(2021)) == 6)
+
+    with pytest.raises(ValueError):
+        material.inverse_mean_free_path_1_nm(1.0e9)
+
+
+def test_compound(elsepa_casino):
+    material = Material.from_atom_fractions(elsepa_casino, {14: 1, 8: 2}, 2.65)
+
+    assert [8, 14] == material.atomic_numbers.tolist()
+    assert 2 == material.number_elements
+    oxygen_mass_g_mol = 2.0 * get_atomic_mass_g_mol(8)
+    silicon_mass_g_mol = get_atomic_mass_g_mol(14)
+    total_mass_g_mol = oxygen_mass_g_mol + silicon_mass_g_mol
+    assert [oxygen_mass_g_mol / total_mass_g_mol, silicon_mass_g_mol / total_mass_g_mol] == approx(
+        material.weight_fractions)
+    assert 2.0 == approx(material.atomic_densities_atom_nm3[0] / material.atomic_densities_atom_nm3[1])
+
+    # The elements of the test archive all have the carbon cross sections.
+    assert np.allclose(2.0 / 3.0, material.cumulative_probabilities[:, 0])
+    assert np.allclose(1.0, material.cumulative_probabilities[:, 1])
+
+    energies_eV = np.full((2, 3), 5.0e3)
+    random_numbers = np.array([[0.0, 0.5, 0.66], [0.67, 0.9, 0.999]])
+    atomic_numbers = material.choose_element(energies_eV, random_numbers)
+    assert [[8, 8, 8], [14, 14, 14]] == atomic_numbers.tolist()
+
+    atomic_numbers = material.choose_element(np.full(100000, 5.0e3), rng=np.random.default_rng(2021))
+    assert np.mean(atomic_numbers == 8) == approx(2.0 / 3.0, abs=0.01)
+
+
+def test_weight_fractions(elsepa_casino):
+    material = Material(elsepa_casino, {6: 2.0, 29: 6.0}, 8.0, energies_eV=[1.0e3, 1.0e4])
+    assert [0.25, 0.75] == approx(material.weight_fractions)
+    assert [1.0e3, 1.0e4] == material.energies_eV.tolist()
+    assert material.inverse_mean_free_paths_1_nm.shape == (2,)
+    assert material.cumulative_probabilities.shape == (2, 2)
+
+    with pytest.raises(ValueError):
+        Material(elsepa_casino, {6: 1.0, 29: 0.0}, 8.0)
+    with pytest.raises(ValueError):
+        Material(elsepa_casino, {}, 8.0)
+
+
+def test_choose_element_interpolation(scaled_elsepa_casino):
+    material = Material.from_atom_fractions(scaled_elsepa_casino, {6: 1, 8: 1}, 1.0)
+    assert material.atomic_densities_atom_nm3[0] == approx(material.atomic_densities_atom_nm3[1])
+
+    probabilities_ref = 1.0 / (1.0 + material.energies_eV / 1.0e3)
+    assert np.allclose(probabilities_ref, material.cumulative_probabilities[:, 0], rtol=1.0e-12)
+
+    row = np.searchsorted(material.energies_eV, 5.0e3, side='right') - 1
+    lower_energy_eV, upper_energy_eV = material.energies_eV[row:row + 2]
+    energy_eV = np.sqrt(lower_energy_eV * upper_energy_eV)
+    probability = 0.5 * (probabilities_ref[row] + probabilities_ref[row + 1])
+    assert probability != approx(probabilities_ref[row], rel=1.0e-6, abs=0.0)
+    assert probability != approx(probabilities_ref[row + 1], rel=1.0e-6, abs=0.0)
+
+    random_numbers = probability * np.array([1.0 - 1.0e-9, 1.0 + 1.0e-9])
+    assert [6, 8] == material.choose_element(energy_eV, random_numbers).tolist()
+
+    atomic_numbers = material.choose_element(np.full(100000, energy_eV), rng=np.random.default_rng(2021))
+    assert np.mean(atomic_numbers == 6) == approx(probability, abs=0.01)